@@ -0,0 +1,951 @@
+"""Benchmarks for plist_time_dump.
+
+Builds a synthetic corpus of Apple-style artifacts, times the decoder's main
+stages on it, and prints (and optionally saves as JSON) each stage's time,
+throughput and peak RSS, so that runs before and after a change can be
+compared:
+
+    python benchmarks/bench.py --output before.json
+    ... change something ...
+    python benchmarks/bench.py --output after.json --compare before.json
+
+The corpus is generated from a fixed seed, so every run of the same --scale
+times the same input. It is written once to a directory in the system temp
+directory (or --corpus) and reused while its parameters match. It holds:
+
+  plists/   one large XML and one large binary plist (thousands of records
+            with native dates, Unix and Cocoa epochs, ISO strings, file
+            paths and embedded bplists), a plist holding an array of
+            NSKeyedArchiver blobs, and a plist of multi-megabyte,
+            digit-dense log strings (what --deepscan's substring scan
+            has to stay linear on)
+  db/       a Core Data-style SQLite store (Z_PK/Z_ENT columns, Cocoa
+            seconds, Unix milliseconds, Cocoa nanoseconds, text, and
+            NSKeyedArchiver BLOBs drawn from a small pool, as real stores
+            repeat them), an sms.db-style message table, and a database
+            with sparse rowids (a two-row table whose rowids are 1 and
+            9e18, and a table with huge gaps between runs of rowids)
+  tree/     a deep directory tree of small Info.plist copies, preference
+            plists and non-plist files
+
+Each benchmark runs in its own child process, so its peak RSS is its own:
+
+  interpret_value            values decoded per second
+  resolve_nskeyedarchiver    archives resolved per second
+  walk                       plist nodes walked per second (_walk over the
+                             parsed large binary plist)
+  process_sqlite_file        rows scanned per second (both databases)
+  process_directory          files per second over the whole corpus, end to
+                             end, writing a TSV
+  open_source                small files per second (the tree) classified
+                             and parsed through _open_source's single open;
+                             also times the old get_file_kind,
+                             get_file_type, plistlib.load path and reports
+                             open() calls per file for both
+  deepscan_strings           characters per second of --deepscan over the
+                             large log strings (_scan_substrings)
+  record_store               records per second stored in a worker's
+                             _RecordStore and pickled for the parent; also
+                             measures (tracemalloc) the memory a scan's
+                             records keep and their pickled size, stored
+                             and as a plain list of Record tuples
+  validate_datetime          records validated per second (--validate's
+                             per-row check, through a shared
+                             DecodeContext); also times re-parsing each
+                             ISO string with validate_timestamp
+
+Times are the best of --repeat runs. Peak RSS is the child's high-water mark
+(VmHWM on Linux, getrusage() elsewhere) and is not available on Windows.
+
+--check times nothing. It decodes a fixed set of strings (edge cases,
+timestamps in every decoded format, seeded random digit-heavy strings, and
+every string in the corpus) through interpret_value's pre-screened string
+path and through the same parsers run unconditionally, scans every corpus
+database both whole and in the rowid chunks --workers would plan, walks
+nested XML plists both streamed (as large ones are) and loaded, and exits 1
+if any result differs, in content or order.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import pickle
+import platform
+import plistlib
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import plist_time_dump as ptd  # noqa: E402
+
+# Bump whenever generate_corpus changes what it writes, so stale corpora are
+# rebuilt rather than silently reused.
+CORPUS_VERSION = 3
+RESULTS_VERSION = 1
+
+COCOA_EPOCH = datetime(2001, 1, 1, tzinfo=timezone.utc)
+# Timestamps fall between these, like a few years of device activity.
+SPAN_START = datetime(2019, 1, 1, tzinfo=timezone.utc)
+SPAN_DAYS = 5 * 365
+
+BENCHMARKS = ("interpret_value", "resolve_nskeyedarchiver", "walk",
+              "process_sqlite_file", "process_directory", "open_source",
+              "validate_datetime", "deepscan_strings",
+              "record_store")
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+def _moment(rnd):
+    return SPAN_START + timedelta(seconds=rnd.uniform(0, SPAN_DAYS * 86400))
+
+
+def _cocoa(dt):
+    return (dt - COCOA_EPOCH).total_seconds()
+
+
+def _archive(rnd, entries):
+    """An NSKeyedArchiver archive (bplist bytes) of an NSDictionary holding
+    `entries` NSDates, NSStrings and numbers, with a shared NSDate and class
+    objects the way Foundation writes them."""
+    objects = ["$null"]
+
+    def add(obj):
+        objects.append(obj)
+        return plistlib.UID(len(objects) - 1)
+
+    date_class = add({"$classname": "NSDate", "$classes": ["NSDate", "NSObject"]})
+    dict_class = add({"$classname": "NSDictionary",
+                      "$classes": ["NSDictionary", "NSObject"]})
+    shared = add({"NS.time": _cocoa(_moment(rnd)), "$class": date_class})
+    keys, values = [], []
+    for i in range(entries):
+        kind = i % 4
+        keys.append(add(("lastModified", "title", "count", "created")[kind] + str(i)))
+        if kind == 0:
+            values.append(add({"NS.time": _cocoa(_moment(rnd)), "$class": date_class}))
+        elif kind == 1:
+            values.append(add(f"Item {rnd.randrange(10_000)}"))
+        elif kind == 2:
+            values.append(add(rnd.randrange(1000)))
+        else:
+            values.append(shared)
+    root = add({"NS.keys": keys, "NS.objects": values, "$class": dict_class})
+    return plistlib.dumps({"$version": 100000, "$archiver": "NSKeyedArchiver",
+                           "$top": {"root": root}, "$objects": objects},
+                          fmt=plistlib.FMT_BINARY)
+
+
+def _record(rnd, i):
+    """One record of the large plists: the mix of fields a LaunchServices or
+    Photos plist carries."""
+    dt = _moment(rnd)
+    record = {
+        "UUID": f"{rnd.getrandbits(128):032X}",
+        "CreationDate": dt.replace(tzinfo=None, microsecond=0),
+        "LastUsedTime": int(dt.timestamp()) + rnd.randrange(86400),
+        "ModifiedCocoa": _cocoa(dt) + rnd.random(),
+        "LastSeen": (dt + timedelta(days=rnd.randrange(30))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "Name": f"IMG_{dt:%Y%m%d_%H%M%S}.HEIC",
+        "Path": f"/private/var/mobile/Media/DCIM/{100 + i % 40}APPLE/IMG_{i:05d}.HEIC",
+        "Flags": rnd.randrange(16),
+        "Size": rnd.randrange(1 << 24),
+        "Children": [{"Index": j, "Duration": rnd.random() * 60} for j in range(3)],
+    }
+    if i % 20 == 0:
+        record["Metadata"] = plistlib.dumps(
+            {"captured": dt.replace(tzinfo=None, microsecond=0),
+             "device": "iPhone", "lens": rnd.randrange(4)},
+            fmt=plistlib.FMT_BINARY)
+    return record
+
+
+def _write_plists(root, rnd, scale):
+    os.makedirs(os.path.join(root, "plists"))
+    records = [_record(rnd, i) for i in range(5_000 * scale)]
+    top = {"Version": 3, "Records": records}
+    with open(os.path.join(root, "plists", "Library.plist"), "wb") as f:
+        plistlib.dump(top, f, fmt=plistlib.FMT_XML)
+    with open(os.path.join(root, "plists", "Library.bplist"), "wb") as f:
+        plistlib.dump(top, f, fmt=plistlib.FMT_BINARY)
+    archives = [_archive(rnd, rnd.randrange(4, 40)) for _ in range(1_000 * scale)]
+    with open(os.path.join(root, "plists", "Archives.plist"), "wb") as f:
+        plistlib.dump({"archives": archives}, f, fmt=plistlib.FMT_BINARY)
+    logs = {f"log{i}": _log_text(rnd, 2_000_000) for i in range(2 * scale)}
+    with open(os.path.join(root, "plists", "Logs.plist"), "wb") as f:
+        plistlib.dump(logs, f, fmt=plistlib.FMT_BINARY)
+
+
+def _log_text(rnd, size):
+    """About `size` characters of unified-log-style text: ISO and custom
+    timestamps, epoch numbers, pids, hex addresses and long digit runs that
+    decode to nothing, packed densely the way a sysdiagnose dump is."""
+    lines, total = [], 0
+    while total < size:
+        dt = _moment(rnd)
+        kind = rnd.randrange(4)
+        if kind == 0:
+            line = (f"{dt:%Y-%m-%d %H:%M:%S}.{rnd.randrange(10**6):06d}-0800 "
+                    f"0x{rnd.getrandbits(32):x} Default 0x0 {rnd.randrange(99999)} "
+                    f"kernel: event={int(dt.timestamp())}")
+        elif kind == 1:
+            line = (f"IMG_{dt:%Y%m%d_%H%M%S}.HEIC {dt:%Y-%m-%d_%H%M%S}-0500 "
+                    f"size={rnd.randrange(1 << 24)} id={rnd.getrandbits(60)}")
+        elif kind == 2:
+            line = " ".join(str(rnd.getrandbits(40)) for _ in range(8))
+        else:
+            line = (f"cocoa={_cocoa(dt):.6f} ms={int(dt.timestamp() * 1000)} "
+                    f"build=21A559 {dt:%Y-%m-%dT%H:%M:%SZ}")
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+
+def _write_databases(root, rnd, scale):
+    os.makedirs(os.path.join(root, "db"))
+    pool = [_archive(rnd, rnd.randrange(4, 24)) for _ in range(64)]
+    filler = [f"ZCOL{i}" for i in range(24)]
+    conn = sqlite3.connect(os.path.join(root, "db", "CoreData.sqlite"))
+    conn.execute(
+        "CREATE TABLE ZRECORD (Z_PK INTEGER PRIMARY KEY, Z_ENT INTEGER, Z_OPT INTEGER, "
+        "ZCREATIONDATE TIMESTAMP, ZMODIFICATIONDATE TIMESTAMP, ZLASTSYNC INTEGER, "
+        "ZEVENTTIME INTEGER, ZTITLE VARCHAR, ZNOTE VARCHAR, ZPAYLOAD BLOB, "
+        + ", ".join(f"{c} INTEGER" if i % 2 else f"{c} VARCHAR"
+                    for i, c in enumerate(filler)) + ")")
+    rows = []
+    for pk in range(1, 10_000 * scale + 1):
+        dt = _moment(rnd)
+        row = [pk, 3, rnd.randrange(5), _cocoa(dt),
+               _cocoa(dt) + rnd.randrange(86400 * 30),
+               int(dt.timestamp() * 1000),
+               int(_cocoa(dt) * 1e9) + rnd.randrange(10**9),
+               f"Note {pk}", "lorem ipsum dolor sit amet " * rnd.randrange(4),
+               rnd.choice(pool) if pk % 3 else None]
+        row += [rnd.randrange(1000) if i % 2 else (None if i % 3 else f"v{pk % 97}")
+                for i in range(len(filler))]
+        rows.append(row)
+    conn.executemany(f"INSERT INTO ZRECORD VALUES ({','.join('?' * len(rows[0]))})", rows)
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(os.path.join(root, "db", "sms.db"))
+    conn.execute("CREATE TABLE message (ROWID INTEGER PRIMARY KEY, guid TEXT, text TEXT, "
+                 "handle_id INTEGER, date INTEGER, date_read INTEGER, "
+                 "date_delivered INTEGER, is_from_me INTEGER)")
+    rows = []
+    for rowid in range(1, 10_000 * scale + 1):
+        ns = int(_cocoa(_moment(rnd)) * 1e9)
+        rows.append((rowid, f"{rnd.getrandbits(64):016X}", f"message {rowid}",
+                     rnd.randrange(200), ns, ns + rnd.randrange(10**12), ns + 10**9,
+                     rnd.randrange(2)))
+    conn.executemany("INSERT INTO message VALUES (?,?,?,?,?,?,?,?)", rows)
+    conn.commit()
+    conn.close()
+
+    # Rowid spans far larger than row counts: what a --workers plan must cut
+    # by rows, not by rowid distance.
+    conn = sqlite3.connect(os.path.join(root, "db", "sparse.db"))
+    conn.execute("CREATE TABLE extremes (id INTEGER PRIMARY KEY, ts INTEGER)")
+    conn.execute("INSERT INTO extremes VALUES (1, ?), (9000000000000000000, ?)",
+                 (int(_moment(rnd).timestamp()), int(_moment(rnd).timestamp())))
+    conn.execute("CREATE TABLE gaps (id INTEGER PRIMARY KEY, created_date REAL, label TEXT)")
+    rows, rowid = [], 0
+    for i in range(5_000 * scale):
+        rowid += rnd.choice((1, 1, 1, 2, 10**6, 10**12))
+        rows.append((rowid, _cocoa(_moment(rnd)), f"label {i}"))
+    conn.executemany("INSERT INTO gaps VALUES (?,?,?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def _write_tree(root, rnd, scale, depth=4, fanout=3):
+    """A deep tree with a few files per directory: Info.plist copies from a
+    small pool (app bundles repeat them), per-directory preference plists,
+    and files that are not plists at all."""
+    infos = [plistlib.dumps({"CFBundleIdentifier": f"com.example.app{i}",
+                             "CFBundleVersion": f"{i}.0",
+                             "BuildMachineOSBuild": "21A559",
+                             "DTPlatformBuild": "19A339"})
+             for i in range(8)]
+    dirs = [os.path.join(root, "tree")]
+    for level in range(depth):
+        dirs = [os.path.join(d, f"d{level}_{j}") for d in dirs for j in range(fanout)]
+        for d in dirs:
+            os.makedirs(d)
+            with open(os.path.join(d, "Info.plist"), "wb") as f:
+                f.write(rnd.choice(infos))
+            prefs = {f"key{k}": _moment(rnd).replace(tzinfo=None, microsecond=0)
+                     for k in range(scale * 4)}
+            prefs["LastLaunch"] = int(_moment(rnd).timestamp())
+            with open(os.path.join(d, "com.example.prefs.plist"), "wb") as f:
+                plistlib.dump(prefs, f, fmt=plistlib.FMT_BINARY)
+            with open(os.path.join(d, "thumb.jpg"), "wb") as f:
+                f.write(b"\xff\xd8\xff\xe0" + rnd.randbytes(4096))
+
+
+def generate_corpus(root, scale=1, seed=0):
+    """Write the benchmark corpus into `root` (which must not exist)."""
+    rnd = random.Random(seed)
+    os.makedirs(root)
+    _write_plists(root, rnd, scale)
+    _write_databases(root, rnd, scale)
+    _write_tree(root, rnd, scale)
+    with open(os.path.join(root, "corpus.json"), "w") as f:
+        json.dump({"version": CORPUS_VERSION, "scale": scale, "seed": seed}, f)
+
+
+def ensure_corpus(root, scale, seed):
+    """Reuse the corpus at `root` if it was built with these parameters,
+    otherwise (re)build it."""
+    manifest = os.path.join(root, "corpus.json")
+    try:
+        with open(manifest) as f:
+            if json.load(f) == {"version": CORPUS_VERSION, "scale": scale, "seed": seed}:
+                return
+    except (OSError, ValueError):
+        pass
+    if os.path.exists(root):
+        # Only ever a directory this script created (it has, or had, a
+        # manifest); refuse to delete anything else.
+        if os.listdir(root) and not os.path.exists(manifest):
+            sys.exit(f"{root} exists and is not a benchmark corpus; pass --corpus")
+        import shutil
+        shutil.rmtree(root)
+    print(f"Generating corpus (scale {scale}) in {root} ...", file=sys.stderr)
+    generate_corpus(root, scale, seed)
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks (each run in a child process; see _run_child)
+# ---------------------------------------------------------------------------
+
+def _options(**overrides):
+    """Options as the CLI builds them with no flags."""
+    options = ptd.Options(validate=False, deepscan=False, nocontext=False,
+                          nonest=False, nestdepth=5,
+                          date_filter=ptd.DateRangeFilter(),
+                          decode_ctx=ptd.DecodeContext())
+    return options._replace(**overrides)
+
+
+def _timed(fn, repeat):
+    """Best wall-clock time of `repeat` calls of fn(); fn returns the number
+    of items it processed."""
+    best, items = None, 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, items
+
+
+def bench_interpret_value(corpus, repeat):
+    # Mostly distinct values, as a large source has; a fresh DecodeContext
+    # per repeat so the interpret_value memo starts empty every time.
+    rnd = random.Random(1)
+    values = []
+    for i in range(100_000):
+        dt = _moment(rnd)
+        kind = i % 8
+        if kind == 0:
+            values.append(int(dt.timestamp()))
+        elif kind == 1:
+            values.append(int(dt.timestamp() * 1000))
+        elif kind == 2:
+            values.append(_cocoa(dt) + rnd.random())
+        elif kind == 3:
+            values.append(int(_cocoa(dt) * 1e9))
+        elif kind == 4:
+            values.append(dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ"))
+        elif kind == 5:
+            values.append(rnd.randrange(1000))
+        elif kind == 6:
+            values.append(f"Item {rnd.randrange(10**6)}")
+        else:
+            values.append(dt.replace(tzinfo=None))
+
+    def run():
+        ctx = ptd.DecodeContext()
+        for value in values:
+            ptd.interpret_value(value, False, ctx)
+        return len(values)
+    return _timed(run, repeat), "values"
+
+
+def bench_resolve_nskeyedarchiver(corpus, repeat):
+    with open(os.path.join(corpus, "plists", "Archives.plist"), "rb") as f:
+        archives = [plistlib.loads(blob) for blob in plistlib.load(f)["archives"]]
+
+    def run():
+        for archive in archives:
+            ptd._resolve_nskeyedarchiver(archive)
+        return len(archives)
+    return _timed(run, repeat), "archives"
+
+
+def bench_walk(corpus, repeat):
+    with open(os.path.join(corpus, "plists", "Library.bplist"), "rb") as f:
+        tree = plistlib.load(f)
+
+    def run():
+        options = _options()
+        budget = ptd._WalkBudget("<bench>")
+        ptd._walk(tree, None, "", None, options, 0, [], budget)
+        return budget.limit - budget.remaining
+    return _timed(run, repeat), "nodes"
+
+
+def bench_process_sqlite_file(corpus, repeat):
+    paths = [os.path.join(corpus, "db", name) for name in ("CoreData.sqlite", "sms.db")]
+    rows = 0
+    for path in paths:
+        conn = sqlite3.connect(path)
+        for (table,) in conn.execute("SELECT name FROM sqlite_master WHERE type='table'"):
+            rows += conn.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0]
+        conn.close()
+
+    def run():
+        options = _options()
+        with ptd._TSVOutput(os.devnull, ptd.build_headers(options)) as writer, \
+                contextlib.redirect_stdout(io.StringIO()):
+            for path in paths:
+                ptd.process_sqlite_file(path, writer, options)
+        return rows
+    return _timed(run, repeat), "rows"
+
+
+def bench_process_directory(corpus, repeat):
+    files = sum(len(names) for _, _, names in os.walk(corpus))
+    with tempfile.TemporaryDirectory() as out:
+        output = os.path.join(out, "timeline.tsv")
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                ptd.process_directory(corpus, output, _options())
+            return files
+        return _timed(run, repeat), "files"
+
+
+class _OpenCounter:
+    """Stands in for the built-in open() inside plist_time_dump, counting
+    calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return open(*args, **kwargs)
+
+
+def bench_open_source(corpus, repeat):
+    # The tree's small plists and non-plist files, as process_directory
+    # meets them: per-file overhead is what the single open saves, and the
+    # large plists would only time their parse. No DecodeContext, so content
+    # dedup (only possible with the single open's bytes) doesn't flatter the
+    # new path.
+    paths = sorted(os.path.join(root, name)
+                   for root, _, names in os.walk(os.path.join(corpus, "tree"))
+                   for name in names)
+    options = _options(decode_ctx=None)
+
+    def single():
+        for path in paths:
+            with ptd._open_source(path) as source:
+                if source.kind in ("plist", "bplist"):
+                    ptd._scan_plist(path, options, [], data=source.data)
+        return len(paths)
+
+    def separate():
+        for path in paths:
+            if ptd.get_file_kind(path) in ("plist", "bplist"):
+                ptd.get_file_type(path)
+                ptd._scan_plist(path, options, [])
+        return len(paths)
+
+    extra = {}
+    counter = ptd.open = _OpenCounter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for name, fn in (("separate", separate), ("single", single)):
+                counter.calls = 0
+                fn()
+                extra[f"{name}_opens_per_file"] = round(counter.calls / len(paths), 2)
+    finally:
+        del ptd.open
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds, _ = _timed(separate, repeat)
+        extra["separate_seconds"] = round(seconds, 4)
+        timed = _timed(single, repeat)
+    return timed, "files", extra
+
+
+def bench_deepscan_strings(corpus, repeat):
+    with open(os.path.join(corpus, "plists", "Logs.plist"), "rb") as f:
+        logs = plistlib.load(f)
+    chars = sum(len(text) for text in logs.values())
+
+    def run():
+        records = ptd.extract_records(logs, _options(deepscan=True), source="<bench>")
+        run.records = len(records)
+        return chars
+    timed = _timed(run, repeat)
+    return timed, "chars", {"records": run.records}
+
+
+def bench_record_store(corpus, repeat):
+    # The Records a worker would hold for the corpus databases (the largest
+    # per-source batches in the corpus), contexts rendered as _SettledRecords
+    # renders them, kept either as a list of Record tuples or in a
+    # _RecordStore.
+    options = _options(decode_ctx=None)
+    records = []
+    for name in ("CoreData.sqlite", "sms.db"):
+        ptd._scan_sqlite(os.path.join(corpus, "db", name), options, records)
+    records = [ptd._render_context(r) for r in records]
+    store = ptd._RecordStore()
+    for r in records:
+        store.append(r)
+
+    # Memory is what unpickling each form allocates: exactly the objects that
+    # form keeps, owned by nothing else.
+    import tracemalloc
+    extra = {}
+    for name, kept in (("list", records), ("store", store)):
+        blob = pickle.dumps(kept)
+        extra[f"{name}_pickled_mb"] = round(len(blob) / (1 << 20), 1)
+        tracemalloc.start()
+        copy = pickle.loads(blob)
+        extra[f"{name}_retained_mb"] = round(
+            tracemalloc.get_traced_memory()[0] / (1 << 20), 1)
+        tracemalloc.stop()
+        del copy, blob
+
+    def run():
+        store = ptd._RecordStore()
+        for r in records:
+            store.append(r)
+        pickle.dumps(store)
+        return len(records)
+    return _timed(run, repeat), "records", extra
+
+
+def bench_validate_datetime(corpus, repeat):
+    # Decoded timestamps as the output sink sees them: mostly inside the
+    # corpus span, some decades old, some in the reference year or future.
+    rnd = random.Random(2)
+    now = datetime.now(timezone.utc)
+    stamps = []
+    for i in range(100_000):
+        kind = i % 10
+        if kind == 0:
+            dt = now + timedelta(seconds=rnd.uniform(-180 * 86400, 180 * 86400))
+        elif kind == 1:
+            dt = datetime(rnd.randrange(1970, 2000), 1, 1, tzinfo=timezone.utc) \
+                + timedelta(seconds=rnd.uniform(0, 365 * 86400))
+        else:
+            dt = _moment(rnd)
+        stamps.append(dt)
+    isos = [dt.strftime(ptd.ISO_OUT) for dt in stamps]
+
+    def by_datetime():
+        ctx = ptd.DecodeContext(now=now)
+        for dt in stamps:
+            ptd.validate_datetime(dt, ctx=ctx)
+        return len(stamps)
+
+    def by_string():
+        ctx = ptd.DecodeContext(now=now)
+        for iso in isos:
+            ptd.validate_timestamp(iso, ctx=ctx)
+        return len(isos)
+
+    ctx = ptd.DecodeContext(now=now)
+    differing = sum(ptd.validate_datetime(dt, ctx=ctx) != ptd.validate_timestamp(iso, ctx=ctx)
+                    for dt, iso in zip(stamps, isos))
+    seconds, _ = _timed(by_string, repeat)
+    return _timed(by_datetime, repeat), "records", {
+        "validate_timestamp_seconds": round(seconds, 4),
+        "differing_verdicts": differing}
+
+
+def _peak_rss_mb():
+    # On Linux, prefer VmHWM: ru_maxrss carries over the parent's peak at the
+    # time of the fork, so a parent that just built the corpus would report
+    # its own size for every benchmark.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def _run_child(name, corpus, repeat):
+    # A benchmark returns ((seconds, items), unit), plus a dict of further
+    # figures worth reporting when it has any.
+    (seconds, items), unit, *extra = globals()[f"bench_{name}"](corpus, repeat)
+    result = {"seconds": round(seconds, 4), "items": items, "unit": unit,
+              "throughput": round(items / seconds, 1) if seconds else None,
+              "peak_rss_mb": _peak_rss_mb()}
+    if extra:
+        result["extra"] = extra[0]
+    json.dump(result, sys.stdout)
+
+
+def run_benchmark(name, corpus, repeat):
+    """Run one benchmark in a fresh interpreter and return its result dict."""
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name,
+                           "--corpus", corpus, "--repeat", str(repeat)],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(f"Benchmark {name} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout)
+
+
+# ---------------------------------------------------------------------------
+# Equivalence check (--check)
+# ---------------------------------------------------------------------------
+
+# Strings at the edges of the string pre-screen in _interpret_value (the
+# `s[:4].isdecimal()` gate before the date parsers, NUMBER_SHAPE_RE before
+# float()): what float() and datetime.fromisoformat() accept beyond the
+# obvious shapes.
+CHECK_STRINGS = (
+    "", " ", "0", "-0", "+0", ".5", "5.", "-.5e3", "1e", "e5", "1e+", "1e9", "1E9",
+    "1600000000", " 1600000000 ", "+1600000000", "-1600000000", "1600000000.5",
+    "1.6e9", "1.6E+09", "1_600_000_000", "1__6", "_1600000000", "1600000000_",
+    "1600000000000", "1600000000000000", "1600000000000000000", "631152000",
+    "0x5F5E1000", "0o17", "0b101", "1,600,000,000", "1600000000L", "16e8j",
+    "inf", "-inf", "Infinity", "nan", "NaN", "-nan",
+    "\u0661\u0666\u0660\u0660\u0660\u0660\u0660\u0660\u0660\u0660",
+    "\uff11\uff16\uff10\uff10\uff10\uff10\uff10\uff10\uff10\uff10",
+    "\u0968\u0966\u0968\u0967-03-04", "\u00b2\u00b3\u00b9\u2070",
+    "1600000000\u00a0", "\u2003" + "1.6e9",
+    "2021", "20210304", "2021-03", "2021-03-04", "2021-3-4", "2021-03-04T05:06:07",
+    "2021-03-04T05:06:07Z", "2021-03-04T05:06:07.123456Z", "2021-03-04 05:06:07+02:00",
+    "2021-03-04T05:06:07-0800", "20210304T050607Z", "2021-W09", "2021-W09-4",
+    "2021-063", "2021-03-04T05", "2021-03-04T05:06:07,5Z", "2021-02-30", "0001-01-01",
+    "9999-12-31T23:59:59Z", "+2021-03-04", "-2021-03-04", "T05:06:07", "05:06:07",
+    "2021-03-04_050607-0500", "2021-03-04_050607+0000", "2021-03-04_250607-0500",
+    "2021-03-04_050607", "12345678", "1234 5678", "2021 03 04",
+    "com.apple.Safari", "/private/var/mobile/Library", "IMG_20210304_050607.HEIC",
+    "E621E1F8-C36C-495A-93FC-0C247A3E6E5F", "Item 42", "v1.2.3", "10.15.7",
+)
+
+_CHECK_ALPHABET = "0123456789" * 4 + "+-._eE:TZ W/\u0661\uff11\u00a0x"
+
+
+def _unscreened_interpret(value, deepscan, ctx):
+    """The string branch of ptd._interpret_value without its pre-screen:
+    every parser runs on every string."""
+    s = value.strip()
+    if not s:
+        return []
+    raw = []
+    dt = ptd._try_iso(s)
+    if dt is not None:
+        raw.append((dt, "ISO_8601", "high"))
+    dt = ptd._try_custom(s)
+    if dt is not None:
+        raw.append((dt, "Custom_format", "high"))
+    if not raw:
+        num = ptd._try_float(s)
+        if num is not None:
+            raw.extend(ptd._numeric_candidates(num))
+    if deepscan and not raw:
+        raw.extend(ptd._scan_substrings(value))
+    return ptd._finalize(raw, deepscan, ctx)
+
+
+def _plist_strings(value, out):
+    if isinstance(value, str):
+        out.add(value)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            out.add(k)
+            _plist_strings(v, out)
+    elif isinstance(value, list):
+        for v in value:
+            _plist_strings(v, out)
+
+
+def check_strings(corpus, seed=0):
+    """The fixed set of strings --check decodes both ways: CHECK_STRINGS,
+    timestamps rendered in every format and unit the tool decodes, random
+    strings over a digit-heavy alphabet, and every string in the corpus's
+    large plist and SQLite TEXT columns."""
+    rnd = random.Random(seed)
+    strings = set(CHECK_STRINGS)
+    for _ in range(2_000):
+        dt = _moment(rnd)
+        ts = dt.timestamp()
+        strings.update((
+            str(int(ts)), repr(ts), str(int(ts * 1000)), str(int(ts * 1e6)),
+            repr(_cocoa(dt)), str(int(_cocoa(dt) * 1e9)), f"{ts:e}",
+            dt.isoformat(), dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            dt.strftime("%Y-%m-%d %H:%M:%S"), dt.strftime("%Y%m%dT%H%M%S"),
+            dt.strftime("%Y-%m-%d_%H%M%S") + rnd.choice(("-0500", "+0930", "+0000")),
+        ))
+    for _ in range(20_000):
+        strings.add("".join(rnd.choice(_CHECK_ALPHABET)
+                            for _ in range(rnd.randrange(1, 24))))
+    with open(os.path.join(corpus, "plists", "Library.bplist"), "rb") as f:
+        _plist_strings(plistlib.load(f), strings)
+    for name in ("CoreData.sqlite", "sms.db"):
+        conn = sqlite3.connect(os.path.join(corpus, "db", name))
+        try:
+            for (table,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table'").fetchall():
+                cur = conn.execute(f'SELECT * FROM "{table}"')
+                for row in cur:
+                    strings.update(v for v in row if isinstance(v, str))
+        finally:
+            conn.close()
+    return sorted(strings)
+
+
+def check_prescreen(corpus, seed=0):
+    """Decode every check string with and without the pre-screen, in both
+    default and --deepscan mode, and print each disagreement. Returns the
+    number of disagreements."""
+    strings = check_strings(corpus, seed)
+    ctx = ptd.DecodeContext()
+    mismatches = 0
+    for deepscan in (False, True):
+        for s in strings:
+            got = ptd._interpret_value(s, deepscan, ctx)
+            want = _unscreened_interpret(s, deepscan, ctx)
+            if got != want:
+                mismatches += 1
+                print(f"MISMATCH deepscan={deepscan} {s!r}: "
+                      f"screened {got!r}, unscreened {want!r}")
+    print(f"Checked {len(strings):,} strings (default and --deepscan): "
+          f"{mismatches} mismatch(es).")
+    return mismatches
+
+
+def _record_rows(records):
+    return [tuple(ptd._render_context(r)) for r in records]
+
+
+def check_sqlite_chunks(corpus, chunk_rows=1_000):
+    """Scan every corpus database whole, then task by task as --workers
+    --sqlite-chunk-rows `chunk_rows` plans it, and print each database
+    whose records differ. Returns the number of such databases."""
+    mismatches = 0
+    names = sorted(os.listdir(os.path.join(corpus, "db")))
+    for name in names:
+        path = os.path.join(corpus, "db", name)
+        options = _options(sqlite_chunk_rows=chunk_rows)
+        whole = []
+        ptd._scan_sqlite(path, options, whole)
+        start = time.perf_counter()
+        plan = ptd._plan_sqlite(path, chunk_rows)
+        planned = time.perf_counter() - start
+        chunked = []
+        for units in plan or [None]:
+            ptd._scan_sqlite(path, options, chunked, units=units)
+        if _record_rows(whole) != _record_rows(chunked):
+            mismatches += 1
+            print(f"MISMATCH {name}: {len(whole):,} records scanned whole, "
+                  f"{len(chunked):,} in {len(plan or [None])} chunked task(s)")
+        else:
+            print(f"  {name}: {len(plan or [None])} task(s) planned in "
+                  f"{planned:.3f}s, {len(whole):,} records either way")
+    print(f"Checked {len(names)} database(s) scanned whole and in chunks of "
+          f"{chunk_rows:,} rows: {mismatches} mismatch(es).")
+    return mismatches
+
+
+def _nested_plists(rnd):
+    """XML plists whose dicts mix scalars (which wait for their Context)
+    with nested containers before and after them: the shapes where a
+    streamed walk has to hold records back to keep document order."""
+    def track(i):
+        return {"Track ID": i, "Name": f"Song {i}", "Date Added": _moment(rnd).replace(
+                    tzinfo=None, microsecond=0),
+                "Play Date UTC": int(_moment(rnd).timestamp()),
+                "Artwork": plistlib.dumps({"modified": _cocoa(_moment(rnd))},
+                                          fmt=plistlib.FMT_BINARY)}
+    library = {"Major Version": 1, "Date": _moment(rnd).replace(tzinfo=None, microsecond=0),
+               "Tracks": {str(i): track(i) for i in range(300)},
+               "Later": int(_moment(rnd).timestamp()),
+               "Playlists": [{"Name": f"List {j}", "Created": _moment(rnd).strftime(
+                                  "%Y-%m-%dT%H:%M:%SZ"),
+                              "Items": [{"Track ID": i} for i in range(j, 300, 7)]}
+                             for j in range(5)],
+               "Last": _cocoa(_moment(rnd))}
+    deep = node = {}
+    for depth in range(30):
+        node["created_date"] = int(_moment(rnd).timestamp())
+        node["child"] = {}
+        node["modified"] = _moment(rnd).replace(tzinfo=None, microsecond=0)
+        node = node["child"]
+    return {"library": plistlib.dumps(library), "deep": plistlib.dumps(deep)}
+
+
+def check_xml_streaming(corpus, seed=0):
+    """Walk XML plists both streamed (_StreamingXMLPlist, as used for large
+    files) and loaded (extract_records), with and without spilling the
+    streamed queue to disk, and print each plist whose records differ in
+    content or order. Returns the number of such differences."""
+    plists = _nested_plists(random.Random(seed))
+    with open(os.path.join(corpus, "plists", "Library.plist"), "rb") as f:
+        plists["Library.plist"] = f.read()
+    mismatches = 0
+    spill_rows = ptd.XML_SPILL_ROWS
+    try:
+        for name, data in plists.items():
+            options = _options()
+            loaded = ptd.extract_records(plistlib.loads(data), options, source=name)
+            for ptd.XML_SPILL_ROWS in (spill_rows, 1):
+                streamed = []
+                ptd._StreamingXMLPlist(name, options, streamed,
+                                       ptd._WalkBudget(name)).parse(io.BytesIO(data))
+                if _record_rows(streamed) != _record_rows(loaded):
+                    mismatches += 1
+                    print(f"MISMATCH {name} (spill after {ptd.XML_SPILL_ROWS} rows): "
+                          f"{len(streamed):,} records streamed, {len(loaded):,} loaded")
+    finally:
+        ptd.XML_SPILL_ROWS = spill_rows
+    print(f"Checked {len(plists)} XML plist(s) streamed and loaded: "
+          f"{mismatches} mismatch(es).")
+    return mismatches
+
+
+def run_check(corpus, seed=0):
+    """Run every equivalence check; returns the total number of mismatches."""
+    return (check_prescreen(corpus, seed) + check_sqlite_chunks(corpus)
+            + check_xml_streaming(corpus, seed))
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def _git_revision():
+    try:
+        proc = subprocess.run(["git", "-C", REPO_ROOT, "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True)
+    except OSError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def print_results(results, baseline=None):
+    base = (baseline or {}).get("results", {})
+    print(f"{'benchmark':<26}{'seconds':>10}{'throughput':>20}{'peak RSS':>12}"
+          + (f"{'vs baseline':>14}" if baseline else ""))
+    for name, r in results.items():
+        rss = f"{r['peak_rss_mb']:.1f} MB" if r["peak_rss_mb"] is not None else "n/a"
+        rate = (f"{r['throughput']:,.0f} {r['unit']}/s" if r["throughput"] is not None
+                else "n/a")
+        line = f"{name:<26}{r['seconds']:>10.3f}{rate:>20}{rss:>12}"
+        old = base.get(name)
+        if old and old.get("throughput") and r["throughput"]:
+            change = 100.0 * (r["throughput"] / old["throughput"] - 1)
+            line += f"{change:>+13.1f}%"
+        print(line)
+    for name, r in results.items():
+        if r.get("extra"):
+            print(f"  {name}: " + ", ".join(f"{k} {v}" for k, v in r["extra"].items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time plist_time_dump on a synthetic Apple-artifact corpus.")
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK",
+                        help=f"Benchmarks to run (default all): {', '.join(BENCHMARKS)}.")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Corpus size multiplier (default 1).")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default 0).")
+    parser.add_argument("--corpus", metavar="DIR",
+                        help="Where to build (or reuse) the corpus (default: a directory "
+                             "in the system temp directory).")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Time each benchmark this many times and keep the best "
+                             "(default 3).")
+    parser.add_argument("--output", metavar="JSON", help="Save the results here.")
+    parser.add_argument("--compare", metavar="JSON",
+                        help="Show each throughput's change against an earlier --output.")
+    parser.add_argument("--check", action="store_true",
+                        help="Instead of timing anything, check that the string "
+                             "pre-screen in interpret_value decodes the corpus exactly "
+                             "as the unscreened parsers do, that every database "
+                             "scans the same whole and in --workers rowid chunks, and "
+                             "that streamed XML plists give the same records in the "
+                             "same order as loaded ones; exit 1 on any difference.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    corpus = args.corpus or os.path.join(
+        tempfile.gettempdir(), f"plist_time_dump_bench_s{args.scale}_{args.seed}")
+    repeat = max(1, args.repeat)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    if args.child:
+        _run_child(args.child, corpus, repeat)
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if (baseline.get("scale"), baseline.get("seed")) != (args.scale, args.seed):
+            print(f"Note: {args.compare} was run on a different corpus "
+                  f"(scale {baseline.get('scale')}, seed {baseline.get('seed')}).",
+                  file=sys.stderr)
+    ensure_corpus(corpus, args.scale, args.seed)
+    if args.check:
+        sys.exit(1 if run_check(corpus, args.seed) else 0)
+    results = {}
+    for name in args.benchmarks or BENCHMARKS:
+        print(f"Running {name} ...", file=sys.stderr)
+        results[name] = run_benchmark(name, corpus, repeat)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "version": RESULTS_VERSION,
+                "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "revision": _git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "numpy": ptd.np is not None,
+                "scale": args.scale,
+                "seed": args.seed,
+                "repeat": repeat,
+                "results": results,
+            }, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
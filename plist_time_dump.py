@@ -1,12 +1,49 @@
 import os
+import pickle
 import sys
 import sqlite3
 import plistlib
+import codecs
 import csv
+import fnmatch
+import hashlib
 import re
-from collections import namedtuple
+import struct
+import tempfile
+from array import array
+import contextlib
+import gzip
+import io
+import json
+import mmap
+import threading
+import time
+from collections import namedtuple, deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from queue import Queue
+from xml.parsers.expat import ParserCreate
+
+# NumPy is optional. With it, numeric SQLite columns are decoded a chunk at a
+# time (see interpret_numeric_batch); without it, one value at a time.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# pyarrow is optional too; it is only needed for --format parquet.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# zstandard is optional; it is only needed to write .zst output.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # Requires Python 3.11+: we rely on the modernized datetime.fromisoformat() to parse
 # 'Z' suffixes, offsets without a colon (e.g. -0500), and basic-format times. Earlier
@@ -25,6 +62,7 @@ SCRIPT_VERSION = "3.0"
 EPOCH_1601 = datetime(1601, 1, 1, tzinfo=timezone.utc)  # Windows FILETIME
 EPOCH_1904 = datetime(1904, 1, 1, tzinfo=timezone.utc)  # HFS+ epoch
 EPOCH_2001 = datetime(2001, 1, 1, tzinfo=timezone.utc)  # Apple Cocoa / Core Data (CFAbsoluteTime)
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 # Canonical ISO 8601 output format used throughout the report.
 ISO_OUT = "%Y-%m-%dT%H:%M:%S.%fZ"
@@ -43,6 +81,12 @@ ISO_SUBSTR_RE = re.compile(
 )
 EPOCH_SUBSTR_RE = re.compile(r'(?<!\d)\d{9,19}(?:\.\d+)?(?!\d)')
 
+# Loose shape of every string float() turns into a finite number: a superset
+# of its grammar (sign, digits with "_" separators, point, exponent), so the
+# pre-check in _interpret_value never rejects one it would accept. \d matches
+# any Unicode decimal digit, as float() does.
+NUMBER_SHAPE_RE = re.compile(r'[+-]?[\d_.]+(?:[eE][+-]?[\d_]+)?')
+
 # A single decoded interpretation of a raw value.
 Candidate = namedtuple("Candidate", "iso fmt confidence dt")
 # A row destined for the report.
@@ -83,11 +127,292 @@ UNIT_RANGE = {
 
 CONF_WEIGHT = {"high": 3, "medium": 2, "low": 1}
 
+# unit -> (its epoch in Unix seconds, ticks per second): raw = (unix - epoch) * ticks.
+# Inverse of _epoch_to_dt, used to push a date range down into SQL (see _numeric_windows).
+UNIT_SCALE = {
+    "unix_s":     (0.0, 1),
+    "unix_ms":    (0.0, 1e3),
+    "unix_ns":    (0.0, 1e9),
+    "cocoa":      (EPOCH_2001.timestamp(), 1),
+    "cocoa_ms":   (EPOCH_2001.timestamp(), 1e3),
+    "cocoa_ns":   (EPOCH_2001.timestamp(), 1e9),
+    "hfs":        (EPOCH_1904.timestamp(), 1),
+}
+
 
 # ---------------------------------------------------------------------------
 # Decoding helpers
 # ---------------------------------------------------------------------------
 
+# interpret_value memo bounds (see _DecodeMemo). Together they cap the memo at
+# a few tens of MB however adversarial the input.
+MEMO_MAX_ENTRIES = 16_384
+MEMO_MAX_STR = 128          # longer strings are decoded every time
+MEMO_MAX_CANDIDATES = 4     # and so are values that decode many ways
+_MEMO_TYPES = frozenset((int, float, str, datetime))
+
+# Content dedup bounds (see _ContentDedup): entries kept, Records held across
+# all of them, and digests remembered while waiting for a second sighting.
+DEDUP_MAX_ENTRIES = 4096
+DEDUP_MAX_RECORDS = 65_536
+DEDUP_MAX_SEEN = 65_536
+
+
+class _DecodeMemo:
+    """Bounded LRU of interpret_value results, keyed by (type, value, deepscan).
+
+    Forensic sources repeat themselves: the same NSDate, the same 0 or
+    978307200 sentinel and the same ISO string turn up hundreds of thousands
+    of times across a database's rows or a plist's arrays, and every one used
+    to be decoded from scratch. A result only depends on the value, deepscan
+    and the DecodeContext's windows, so each DecodeContext owns one memo.
+
+    Memory stays bounded on hostile input: at most MEMO_MAX_ENTRIES entries,
+    least recently used evicted first; strings longer than MEMO_MAX_STR and
+    results with more than MEMO_MAX_CANDIDATES candidates are never stored.
+    The type is part of the key so 1, 1.0 and True never share an entry.
+    Cached lists are shared between callers, which must not modify them.
+
+    `hits`, `misses` and `skipped` (values not eligible for the memo) feed
+    --stats.
+    """
+
+    __slots__ = ("_entries", "hits", "misses", "skipped")
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self.hits = self.misses = self.skipped = 0
+
+    def interpret(self, value, deepscan, ctx):
+        cls = type(value)
+        if cls not in _MEMO_TYPES or (cls is str and len(value) > MEMO_MAX_STR):
+            self.skipped += 1
+            return _interpret_value(value, deepscan, ctx)
+        key = (cls, value, deepscan)
+        entries = self._entries
+        result = entries.get(key)
+        if result is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return result
+        self.misses += 1
+        result = _interpret_value(value, deepscan, ctx)
+        if len(result) <= MEMO_MAX_CANDIDATES:
+            entries[key] = result
+            if len(entries) > MEMO_MAX_ENTRIES:
+                entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drop every entry and zero the counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.skipped = 0
+
+    def take_counts(self):
+        """(hits, misses, skipped) since the last call, then zero them; how a
+        worker hands its share of the counts back to the parent."""
+        counts = (self.hits, self.misses, self.skipped)
+        self.hits = self.misses = self.skipped = 0
+        return counts
+
+    def add_counts(self, counts):
+        hits, misses, skipped = counts
+        self.hits += hits
+        self.misses += misses
+        self.skipped += skipped
+
+    def summary(self):
+        """One-line report for --stats."""
+        looked_up = self.hits + self.misses
+        rate = f"{100.0 * self.hits / looked_up:.1f}%" if looked_up else "n/a"
+        return (f"Decode memo: {self.hits} hit(s), {self.misses} miss(es) "
+                f"({rate} hit rate), {self.skipped} value(s) not memoized.")
+
+
+class _ContentDedup:
+    """Bounded LRU of decoded results, keyed by a digest of the bytes decoded.
+
+    Apple sources repeat whole serialized plists: one NSKeyedArchiver blob
+    in thousands of ZOBJECT rows, one Info.plist in every copy of an app
+    bundle. What a blob or a small file decodes to depends only on its bytes
+    and the run's options (plus, for an embedded plist, the key it sits
+    under and its nesting depth, which are part of the key), so each repeat
+    can reuse the first copy's Records instead of being parsed, resolved and
+    walked again. An embedded plist's Records are kept with key paths
+    relative to the blob and re-stamped with each copy's own prefix.
+
+    Only a decode that ran to completion is stored -- no truncation, no
+    warning -- with its contexts rendered, and with the walk-budget nodes it
+    used: a hit charges the same nodes, and is passed over (decoded afresh,
+    truncating exactly as before) if the budget can't cover them. A blob
+    plistlib rejects is stored as None, so a repeat skips the parse attempt.
+
+    Memory stays bounded: a digest is only stored on its second sighting
+    (until then it is one of at most DEDUP_MAX_SEEN remembered digests), and
+    at most DEDUP_MAX_ENTRIES entries holding DEDUP_MAX_RECORDS Records in
+    all are kept, least recently used evicted first. A single result over a
+    sixteenth of that is never stored.
+
+    `hits` and `misses`, per kind ("file" / "embedded"), feed --stats.
+    """
+
+    __slots__ = ("_entries", "_seen", "_records", "hits", "misses")
+
+    KINDS = ("file", "embedded")
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._seen = OrderedDict()
+        self._records = 0
+        self.hits = dict.fromkeys(self.KINDS, 0)
+        self.misses = dict.fromkeys(self.KINDS, 0)
+
+    @staticmethod
+    def digest(data):
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def lookup(self, key, kind, remaining=None):
+        """The stored (nodes, records) for `key`, or None on a miss -- which
+        includes an entry needing more than `remaining` budget nodes."""
+        entry = self._entries.get(key)
+        if entry is None or (remaining is not None and entry[0] > remaining):
+            self.misses[kind] += 1
+            return None
+        self.hits[kind] += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def admit(self, key):
+        """Should the decode about to run for `key` be kept? Only once the
+        content has been seen before; a first sighting is just remembered."""
+        if key in self._seen:
+            del self._seen[key]
+            return True
+        self._seen[key] = None
+        if len(self._seen) > DEDUP_MAX_SEEN:
+            self._seen.popitem(last=False)
+        return False
+
+    def store(self, key, nodes, records):
+        """Keep `records` (a tuple, or None for unparseable content) for
+        `key`, `nodes` being the walk-budget nodes the decode used."""
+        size = len(records) if records is not None else 0
+        if size > DEDUP_MAX_RECORDS // 16:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None and old[1] is not None:
+            self._records -= len(old[1])
+        self._entries[key] = (nodes, records)
+        self._records += size
+        while (len(self._entries) > DEDUP_MAX_ENTRIES
+               or self._records > DEDUP_MAX_RECORDS):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            if evicted is not None:
+                self._records -= len(evicted)
+
+    def clear(self):
+        """Drop every entry and zero the counters."""
+        self._entries.clear()
+        self._seen.clear()
+        self._records = 0
+        self.take_counts()
+
+    def take_counts(self):
+        """(hits, misses) since the last call, then zero them; see
+        _DecodeMemo.take_counts."""
+        counts = (self.hits, self.misses)
+        self.hits = dict.fromkeys(self.KINDS, 0)
+        self.misses = dict.fromkeys(self.KINDS, 0)
+        return counts
+
+    def add_counts(self, counts):
+        hits, misses = counts
+        for kind in self.KINDS:
+            self.hits[kind] += hits[kind]
+            self.misses[kind] += misses[kind]
+
+    def summary(self):
+        """One-line report for --stats."""
+        parts = []
+        for kind, label in zip(self.KINDS, ("file(s)", "embedded plist(s)")):
+            looked_up = self.hits[kind] + self.misses[kind]
+            rate = f"{100.0 * self.hits[kind] / looked_up:.1f}%" if looked_up else "n/a"
+            parts.append(f"{self.hits[kind]} of {looked_up} {label} ({rate})")
+        return f"Content dedup: reused {parts[0]} and {parts[1]}."
+
+
+class DecodeContext:
+    """The run's reference "now", and every window derived from it.
+
+    Which decodes are plausible, which get _score's recency bonus, and what
+    validate_timestamp calls too old or in the future all depend on the
+    current date. Reading the clock once per value (or per candidate) is
+    millions of clock reads on a large run, and lets the windows move if the
+    run crosses midnight on New Year's Eve. process_directory builds one
+    DecodeContext per run and carries it in `options.decode_ctx`, so every
+    value is judged against the same instant; --reference-time pins that
+    instant, making a run reproducible later on.
+
+    Functions that take a `ctx` build a fresh one per call when given None,
+    which is the old read-the-clock-every-time behaviour. Only a shared
+    context memoizes interpret_value (see _DecodeMemo) and reuses repeated
+    serialized plists (see _ContentDedup). It also carries the run's
+    per-table SQLite throughput for --stats (see _TableStats). Those three
+    are built on first use, so a throwaway per-call context costs no more
+    than its windows.
+    """
+
+    __slots__ = ("now", "year", "recent_years", "plausible_years",
+                 "validation_years", "_validated", "_memo", "_dedup",
+                 "_table_stats")
+
+    def __init__(self, now=None, validation_years=15):
+        if now is None:
+            now = datetime.now(timezone.utc)
+        self.now = now
+        self.year = now.year
+        # _score's recency bonus.
+        self.recent_years = (now.year - 15, now.year + 2)
+        # _finalize's plausibility window, indexed by deepscan.
+        self.plausible_years = ((1990, now.year + 2), (1970, now.year + 5))
+        # validate_timestamp's too_old / too_future limits.
+        self.validation_years = (now.year - validation_years,
+                                 now.year + validation_years)
+        self._validated = {}
+        self._memo = self._dedup = self._table_stats = None
+
+    @property
+    def memo(self):
+        if self._memo is None:
+            self._memo = _DecodeMemo()
+        return self._memo
+
+    @property
+    def dedup(self):
+        if self._dedup is None:
+            self._dedup = _ContentDedup()
+        return self._dedup
+
+    @property
+    def table_stats(self):
+        if self._table_stats is None:
+            self._table_stats = _TableStats()
+        return self._table_stats
+
+    def validate(self, dt):
+        """validate_datetime against this context's window, memoized: the
+        verdict depends only on the year, except within the reference year
+        itself, where it depends on whether `dt` is past `now`."""
+        year = dt.year
+        if year == self.year:
+            return _check_datetime(dt, self.now, *self.validation_years)
+        verdict = self._validated.get(year)
+        if verdict is None:
+            verdict = _check_datetime(dt, self.now, *self.validation_years)
+            self._validated[year] = verdict
+        return verdict
+
+
 def _epoch_to_dt(n, unit):
     """Convert a numeric epoch value to an aware UTC datetime, or None if out of range."""
     try:
@@ -110,6 +435,17 @@ def _epoch_to_dt(n, unit):
     return None
 
 
+def _dt_to_us(dt):
+    """An aware datetime as exact integer microseconds since the Unix epoch."""
+    delta = dt - _UNIX_EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _us_to_dt(us):
+    """Inverse of _dt_to_us: an aware UTC datetime."""
+    return _UNIX_EPOCH + timedelta(microseconds=us)
+
+
 def _numeric_candidates(n):
     """Return [(dt, label, confidence)] for every plausible epoch interpretation of n."""
     out = []
@@ -159,47 +495,80 @@ def _try_float(s):
         return None
 
 
-def _score(cand):
+def _score(cand, ctx=None):
     """Rank a (dt, label, confidence) candidate for default single-best selection."""
     dt, _label, conf = cand
-    now = datetime.now(timezone.utc)
+    if ctx is None:
+        ctx = DecodeContext()
     w = CONF_WEIGHT[conf]
-    if now.year - 15 <= dt.year <= now.year + 2:  # recency bonus toward the plausible core
+    lo, hi = ctx.recent_years
+    if lo <= dt.year <= hi:  # recency bonus toward the plausible core
         w += 2
     return w
 
 
+class _SpanSweep:
+    """Overlap test against sorted, disjoint (start, end) spans, for matches
+    visited in increasing start order (as finditer yields them).
+
+    A span that ends at or before one match's start can't overlap any later
+    match either, so a single cursor walks the spans once per pass: linear
+    overall, where testing every claimed span per match was quadratic on
+    long, digit-dense text.
+    """
+
+    __slots__ = ("_spans", "_i")
+
+    def __init__(self, spans):
+        self._spans = spans
+        self._i = 0
+
+    def overlaps(self, start, end):
+        spans, i = self._spans, self._i
+        while i < len(spans) and spans[i][1] <= start:
+            i += 1
+        self._i = i
+        return i < len(spans) and spans[i][0] < end
+
+
 def _scan_substrings(text):
     """Find timestamps embedded within a larger string (deepscan only).
 
     Returns [(dt, label, confidence)]. Matches are heuristic, so confidence is
     downgraded relative to whole-value decodes.
+
+    Each pattern makes its own pass, most specific first, and a match that
+    overlaps a span already claimed by an earlier pattern is skipped. Spans
+    claimed within one pass come out sorted and never overlap each other
+    (finditer doesn't return overlapping matches), so the overlap checks are a
+    _SpanSweep and the whole scan stays linear in the length of `text`.
     """
     raw = []
-    consumed = []  # spans already claimed by a more specific pattern
-
-    def overlaps(start, end):
-        return any(not (end <= s or start >= e) for s, e in consumed)
 
     # Most specific first: the custom YYYY-MM-DD_HHMMSS±HHMM format.
+    custom_spans = []
     for m in CUSTOM_SUBSTR_RE.finditer(text):
         dt = _try_custom(m.group())
         if dt is not None:
             raw.append((dt, "Custom_format", "medium"))
-            consumed.append(m.span())
+            custom_spans.append(m.span())
 
     # ISO 8601 (incl. bare dates); skip anything already claimed above.
+    iso_spans = []
+    claimed = _SpanSweep(custom_spans)
     for m in ISO_SUBSTR_RE.finditer(text):
-        if overlaps(*m.span()):
+        if claimed.overlaps(*m.span()):
             continue
         dt = _try_iso(m.group())
         if dt is not None:
             raw.append((dt, "ISO_8601", "medium"))
-            consumed.append(m.span())
+            iso_spans.append(m.span())
 
     # Numeric epoch runs; plausibility gating happens later in _finalize.
+    # (sorted() merges the two already-sorted runs in linear time.)
+    claimed = _SpanSweep(sorted(custom_spans + iso_spans))
     for m in EPOCH_SUBSTR_RE.finditer(text):
-        if overlaps(*m.span()):
+        if claimed.overlaps(*m.span()):
             continue
         num = _try_float(m.group())
         if num is not None:
@@ -209,15 +578,20 @@ def _scan_substrings(text):
     return raw
 
 
-def _finalize(raw, deepscan):
+def _finalize(raw, deepscan, ctx=None):
     """Gate candidates by a plausibility window and reduce to the reported set."""
-    now_year = datetime.now(timezone.utc).year
-    lo = 1970 if deepscan else 1990
-    hi = now_year + (5 if deepscan else 2)
+    if not raw:
+        return []
+    if ctx is None:
+        ctx = DecodeContext()
+    lo, hi = ctx.plausible_years[bool(deepscan)]
     plausible = [t for t in raw if lo <= t[0].year <= hi]
     if not plausible:
         return []
-    chosen = plausible if deepscan else [max(plausible, key=_score)]
+    if deepscan:
+        chosen = plausible
+    else:
+        chosen = [max(plausible, key=lambda cand: _score(cand, ctx))]
 
     out, seen = [], set()
     for dt, label, conf in chosen:
@@ -231,32 +605,47 @@ def _finalize(raw, deepscan):
     return out
 
 
-def interpret_value(value, deepscan=False):
-    """Return the list of plausible Candidate interpretations for a single leaf value."""
+def interpret_value(value, deepscan=False, ctx=None):
+    """Return the list of plausible Candidate interpretations for a single leaf value.
+    `ctx` is the run's DecodeContext (a fresh one per call if None); with one,
+    repeated values are answered from its memo. Don't modify the result."""
+    if ctx is not None:
+        return ctx.memo.interpret(value, deepscan, ctx)
+    return _interpret_value(value, deepscan, ctx)
+
+
+def _interpret_value(value, deepscan, ctx):
     # Native plist <date> objects arrive already parsed by plistlib (naive == UTC).
     if isinstance(value, datetime):
         dt = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
-        return _finalize([(dt.astimezone(timezone.utc), "Plist_date", "high")], deepscan)
+        return _finalize([(dt.astimezone(timezone.utc), "Plist_date", "high")], deepscan, ctx)
 
     # bool is an int subclass; never a timestamp.
     if isinstance(value, bool):
         return []
 
     if isinstance(value, (int, float)):
-        return _finalize(_numeric_candidates(float(value)), deepscan)
+        return _finalize(_numeric_candidates(float(value)), deepscan, ctx)
 
     if isinstance(value, str):
         s = value.strip()
         if not s:
             return []
         raw = []
-        dt = _try_iso(s)
-        if dt is not None:
-            raw.append((dt, "ISO_8601", "high"))
-        dt = _try_custom(s)
-        if dt is not None:
-            raw.append((dt, "Custom_format", "high"))
-        if not raw:  # only try numeric epochs when it isn't already a recognizable date string
+        # Most strings are bundle IDs, paths, UUIDs and prose that every parser
+        # below rejects -- and a rejection costs a raised exception. Screen them
+        # out first: both date formats open with a four-digit year, and only a
+        # string of NUMBER_SHAPE_RE's shape can be a number that decodes
+        # (float() also takes "inf" and "nan", which never do).
+        if s[:4].isdecimal():
+            dt = _try_iso(s)
+            if dt is not None:
+                raw.append((dt, "ISO_8601", "high"))
+            dt = _try_custom(s)
+            if dt is not None:
+                raw.append((dt, "Custom_format", "high"))
+        # only try numeric epochs when it isn't already a recognizable date string
+        if not raw and NUMBER_SHAPE_RE.fullmatch(s):
             num = _try_float(s)
             if num is not None:
                 raw.extend(_numeric_candidates(num))
@@ -264,31 +653,151 @@ def interpret_value(value, deepscan=False):
         # embedded inside it (filenames, paths, log fragments).
         if deepscan and not raw:
             raw.extend(_scan_substrings(value))
-        return _finalize(raw, deepscan)
+        return _finalize(raw, deepscan, ctx)
 
     return []
 
 
+# unit -> (seconds divisor, epoch offset in microseconds) for the batch
+# decoder: exactly the arithmetic _epoch_to_dt does, with the divisor applied
+# as the same float division.
+_BATCH_UNITS = {
+    "unix_s":     (None, 0),
+    "unix_ms":    (1000.0, 0),
+    "unix_ns":    (1e9, 0),
+    "cocoa":      (None, 978_307_200 * 1_000_000),
+    "cocoa_ms":   (1000.0, 978_307_200 * 1_000_000),
+    "cocoa_ns":   (1e9, 978_307_200 * 1_000_000),
+    "hfs":        (None, -2_082_844_800 * 1_000_000),
+}
+
+# Below this many values the array set-up costs more than it saves.
+MIN_NUMERIC_BATCH = 32
+
+
+def interpret_numeric_batch(values, deepscan=False, ctx=None):
+    """interpret_value for a whole sequence of int/float values at once.
+
+    Returns a list aligned with `values`: each entry is the list of
+    Candidates interpret_value would return for that value, or None where it
+    would return none. With NumPy the UNIT_RANGE gates, epoch conversions,
+    plausibility window and _score selection run as array operations over
+    the batch, and ISO strings and datetimes are only built for the chosen
+    candidates; without it (or for a short batch) this is a plain loop over
+    interpret_value.
+
+    The results are identical, not just close: fromtimestamp() and
+    timedelta(seconds=) both land on whole seconds plus the fractional part
+    rounded half-to-even to microseconds, which is modf + rint here, and
+    the unit divisions are the same float divisions.
+    """
+    if np is None or len(values) < MIN_NUMERIC_BATCH:
+        return [interpret_value(v, deepscan, ctx) or None for v in values]
+
+    if ctx is None:
+        ctx = DecodeContext()
+    v = np.asarray(values, dtype=np.float64)
+    lo_year, hi_year = ctx.plausible_years[bool(deepscan)]
+    recent_lo, recent_hi = ctx.recent_years
+
+    per_unit = []  # (unit, usable mask, microseconds since 1970, score)
+    for unit, (lo, hi) in UNIT_RANGE.items():
+        divisor, offset = _BATCH_UNITS[unit]
+        mask = (v >= lo) & (v < hi)
+        if not mask.any():
+            continue
+        secs = v / divisor if divisor else v
+        frac, whole = np.modf(np.where(mask, secs, 0.0))
+        us = (whole.astype(np.int64) * 1_000_000
+              + np.rint(frac * 1e6).astype(np.int64) + offset)
+        years = us.astype("datetime64[us]").astype("datetime64[Y]").astype(np.int64) + 1970
+        mask &= (years >= lo_year) & (years <= hi_year)
+        if not mask.any():
+            continue
+        # _score: confidence weight plus the recency bonus.
+        score = (CONF_WEIGHT[UNIT_META[unit][1]]
+                 + 2 * ((years >= recent_lo) & (years <= recent_hi)))
+        per_unit.append((unit, mask, us, score))
+
+    out = [None] * len(v)
+    if deepscan:
+        # Every plausible unit, in UNIT_RANGE order. Labels differ per unit,
+        # so _finalize's (iso, label) de-duplication never applies.
+        for unit, mask, us, _score_ in per_unit:
+            label, conf = UNIT_META[unit]
+            rows = np.flatnonzero(mask)
+            for i, c in zip(rows.tolist(), _batch_candidates(us[rows], label, conf)):
+                if out[i] is None:
+                    out[i] = [c]
+                else:
+                    out[i].append(c)
+        return out
+
+    # Single best: max() keeps the first of equal scores, so a later unit
+    # only wins with a strictly higher one.
+    best_score = np.full(len(v), -1, dtype=np.int64)
+    best_unit = np.full(len(v), -1, dtype=np.int64)
+    best_us = np.zeros(len(v), dtype=np.int64)
+    for k, (unit, mask, us, score) in enumerate(per_unit):
+        better = mask & (score > best_score)
+        best_score[better] = score[better]
+        best_unit[better] = k
+        best_us[better] = us[better]
+    for k, (unit, _mask, _us, _score_) in enumerate(per_unit):
+        label, conf = UNIT_META[unit]
+        rows = np.flatnonzero(best_unit == k)
+        for i, c in zip(rows.tolist(), _batch_candidates(best_us[rows], label, conf)):
+            out[i] = [c]
+    return out
+
+
+def _batch_candidates(us, label, conf):
+    """Candidates for an int64 array of microseconds since 1970."""
+    isos = np.datetime_as_string(us.astype("datetime64[us]"), unit="us").tolist()
+    return [Candidate(iso + "Z", label, conf,
+                      _UNIX_EPOCH + timedelta(microseconds=t))
+            for iso, t in zip(isos, us.tolist())]
+
+
 # ---------------------------------------------------------------------------
 # Validation & range filtering
 # ---------------------------------------------------------------------------
 
-def validate_timestamp(iso_str, years=15):
-    """Validate an already-formatted ISO timestamp. Returns (is_valid, reason)."""
+def validate_timestamp(iso_str, years=None, ctx=None):
+    """Validate an already-formatted ISO timestamp. Returns (is_valid, reason).
+
+    Parses `iso_str` and hands it to validate_datetime. The output path
+    validates each Record's own `dt` instead: the string was just formatted
+    from it, and re-parsing it with strptime per row was pure cost."""
     try:
         dt = datetime.strptime(iso_str, ISO_OUT).replace(tzinfo=timezone.utc)
     except ValueError:
         return False, "invalid_format"
+    return validate_datetime(dt, years, ctx)
+
+
+def validate_datetime(dt, years=None, ctx=None):
+    """Validate an aware UTC datetime. Returns (is_valid, reason).
+
+    Checked against `ctx` (a DecodeContext; a fresh one if None): not after
+    its `now`, and within its validation window -- or within `years` of its
+    year, if given."""
+    if ctx is None:
+        ctx = DecodeContext()
+    if years is None:
+        return ctx.validate(dt)
+    return _check_datetime(dt, ctx.now, ctx.year - years, ctx.year + years)
 
-    now = datetime.now(timezone.utc)
+
+def _check_datetime(dt, now, oldest, newest):
     issues = []
     if dt > now:
         issues.append("future_date")
     if dt.year < 1970:
         issues.append("pre_1970")
-    if dt.year < now.year - years:
+    if dt.year < oldest:
         issues.append("too_old")
-    elif dt.year > now.year + years:
+    elif dt.year > newest:
         issues.append("too_future")
 
     if issues:
@@ -347,45 +856,159 @@ def _orig_str(value):
     return str(value)
 
 
-def _context_snippet(parent_dict, current_key, limit=200):
+# Maximum length of the Context column.
+CONTEXT_LIMIT = 200
+
+
+def _context_snippet(parent_dict, current_key, limit=CONTEXT_LIMIT):
     """bulk_extractor-style context: the sibling scalar key/values around a timestamp."""
     if parent_dict is None:
         return ""
     parts = []
+    # Stop once the joined length passes `limit`: the rest would be cut off
+    # anyway, and a wide table row can have a hundred more siblings.
+    length = -2
     for k, v in parent_dict.items():
         if k == current_key:
             continue
-        if isinstance(v, (dict, list, bytes)):
+        if isinstance(v, (dict, list, bytes, _LazyDict, _LazyArray)):
             continue
         if isinstance(v, datetime):
             v = v.isoformat()
-        parts.append(f"{k}={v}")
+        part = f"{k}={v}"
+        parts.append(part)
+        length += len(part) + 2
+        if length > limit:
+            break
     snippet = "; ".join(parts)
     if len(snippet) > limit:
         snippet = snippet[: limit - 1] + "…"
     return snippet
 
 
-def _try_embedded_plist(value):
-    """If value is an embedded serialized plist (bplist bytes or inline XML), parse it."""
+class _LazyContext:
+    """A Record's Context before it is needed: the parent and key to build
+    _context_snippet from, rendered on the first str() and then kept.
+
+    Most decoded values never reach the output -- the date-range filter or
+    --validate drops them -- yet building a snippet joins every sibling
+    scalar, long message bodies included. Records carry one of these
+    instead, and whatever writes a Record out (or stores it: the --cache,
+    a worker's result) calls str() on its context. The parent must not
+    change until then; sources are never modified while they are scanned.
+    """
+
+    __slots__ = ("_parent", "_key", "_text")
+
+    def __init__(self, parent, key):
+        self._parent = parent
+        self._key = key
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = _context_snippet(self._parent, self._key)
+            self._parent = None
+        return self._text
+
+
+def _looks_like_embedded_plist(value):
+    """Cheap header sniff: could `value` be a serialized plist worth parsing?
+
+    Skips leading whitespace by searching for the first other character
+    rather than lstrip(), which would copy the whole value -- a thumbnail
+    BLOB, say -- to look at its first eight bytes."""
     if isinstance(value, bytes):
-        head = value.lstrip()[:8]
-        if head.startswith(b"bplist") or head.startswith(b"<?xml"):
-            try:
-                return plistlib.loads(value)
-            except Exception:
-                return None
-        return None
+        start = 0
+        if value[:1].isspace():
+            m = _BPLIST_NON_WS.search(value)
+            if m is None:
+                return False
+            start = m.start()
+        return value.startswith((b"bplist", b"<?xml"), start)
     if isinstance(value, str):
-        stripped = value.lstrip()
-        if stripped.startswith("<?xml") and "plist" in value[:256].lower():
-            try:
-                return plistlib.loads(value.encode("utf-8"))
-            except Exception:
-                return None
+        start = 0
+        if value[:1].isspace():
+            m = _STR_NON_WS.search(value)
+            if m is None:
+                return False
+            start = m.start()
+        return value.startswith("<?xml", start) and "plist" in value[:256].lower()
+    return False
+
+
+# plistlib reads one binary format, "bplist00"; an NSKeyedArchiver archive is
+# an ordinary bplist00 whose top dict names its "$archiver" (unpacked after
+# parsing by _resolve_nskeyedarchiver). "bplist15" and "bplist16" are
+# CoreFoundation's private successors, which plistlib cannot read: a blob in
+# either is recognized as such and left undecoded rather than handed to
+# plistlib.loads to fail on.
+BPLIST_MAGIC = b"bplist00"
+
+
+def _bplist_trailer(buf, start=0, end=None):
+    """The trailer of the bplist00 at buf[start:end] -- (offset_size,
+    ref_size, object_count, top_object, offset_table) -- or None when it is
+    one plistlib would reject outright: too short to hold a trailer, or one
+    whose offset table or top object can't exist. Reads the 32 bytes in
+    place (`buf` may be a mmap)."""
+    if end is None:
+        end = len(buf)
+    if end - start < 32:
+        return None
+    trailer = struct.unpack_from(">6xBBQQQ", buf, end - 32)
+    offset_size, _, count, top, table = trailer
+    if not offset_size or top >= count or table + count * offset_size > end - start:
+        return None
+    return trailer
+
+
+def _embedded_plist_format(buf, start=0, end=None):
+    """plistlib.FMT_BINARY or plistlib.FMT_XML for the serialized plist at
+    buf[start:end] (bytes or a mmap), or None when plistlib.loads would
+    certainly fail on it.
+
+    Stricter than _looks_like_embedded_plist, and exactly as strict as
+    plistlib's own format detection: the header must be at the very start
+    (plistlib does not skip whitespace), and a binary plist must be a
+    bplist00 (see BPLIST_MAGIC) with a sound trailer. Unsupported bplist
+    versions and truncated or random blobs that merely start with "bplist"
+    are turned away here, without a parse attempt or an exception."""
+    if end is None:
+        end = len(buf)
+    head = buf[start:min(start + 8, end)]
+    if head.startswith(b"<?xml"):
+        return plistlib.FMT_XML
+    if head == BPLIST_MAGIC and _bplist_trailer(buf, start, end) is not None:
+        return plistlib.FMT_BINARY
+    return None
+
+
+def _embedded_plist_bytes(value):
+    """(data, fmt) to hand plistlib.loads if `value` may be an embedded
+    serialized plist (bplist bytes or inline XML), else None."""
+    if isinstance(value, bytes):
+        if value.startswith((BPLIST_MAGIC, b"<?xml")):
+            fmt = _embedded_plist_format(value)
+            if fmt is not None:
+                return value, fmt
+    elif isinstance(value, str) and value.startswith("<?xml") \
+            and "plist" in value[:256].lower():
+        return value.encode("utf-8"), plistlib.FMT_XML
     return None
 
 
+def _try_embedded_plist(value):
+    """If value is an embedded serialized plist (bplist bytes or inline XML), parse it."""
+    found = _embedded_plist_bytes(value)
+    if found is None:
+        return None
+    try:
+        return plistlib.loads(found[0], fmt=found[1])
+    except Exception:
+        return None
+
+
 def _archiver_classname(obj, objects):
     """Resolve an NSKeyedArchiver object's $class UID to its $classname string."""
     cls = obj.get("$class")
@@ -801,6 +1424,22 @@ class _TruncationTracker:
         self.truncated_sources += 1
         return self.truncated_sources <= MAX_PRINTED_TRUNCATION_WARNINGS
 
+    def report(self, message):
+        """Count one truncated source and print `message` for it, subject to
+        the run-wide cap. Prints the one-off "further warnings suppressed"
+        line instead once the cap is first exceeded, and nothing after."""
+        if self.note_truncated():
+            print(message)
+        elif self.truncated_sources == MAX_PRINTED_TRUNCATION_WARNINGS + 1:
+            print(
+                f"Warning: more than {MAX_PRINTED_TRUNCATION_WARNINGS} "
+                f"sources have had truncated output during this run "
+                f"-- further per-source truncation warnings are "
+                f"suppressed for the rest of this run (see "
+                f"'{TRUNCATION_MARKER}' rows in the output file "
+                f"for the complete list)."
+            )
+
     def summary(self):
         """A one-line, run-level note if any source truncated this run
         (fix wave 3, Important-5), or None if none did."""
@@ -890,57 +1529,366 @@ class _WalkBudget:
         if self.remaining <= 0:
             if not self._warned:
                 self._warned = True
-                if self._tracker is not None:
-                    if self._tracker.note_truncated():
-                        self._print_warning()
-                    elif self._tracker.truncated_sources == MAX_PRINTED_TRUNCATION_WARNINGS + 1:
-                        print(
-                            f"Warning: more than {MAX_PRINTED_TRUNCATION_WARNINGS} "
-                            f"sources have had truncated output during this run "
-                            f"-- further per-source truncation warnings are "
-                            f"suppressed for the rest of this run (see "
-                            f"'{TRUNCATION_MARKER}' rows in the output file "
-                            f"for the complete list)."
-                        )
-                else:
-                    self._print_warning()
+                _report_truncation(
+                    self._tracker,
+                    f"Warning: node-visit budget ({self.limit}) exhausted "
+                    f"while walking {self._source} -- output for this source "
+                    f"is truncated.",
+                )
             return False
         self.remaining -= 1
         return True
 
-    def _print_warning(self):
-        print(
-            f"Warning: node-visit budget ({self.limit}) exhausted "
-            f"while walking {self._source} -- output for this source "
-            f"is truncated."
-        )
+
+def _report_truncation(tracker, message):
+    """Print a per-source truncation warning, routed through `tracker` (when
+    there is one) so it shares the run-wide warning cap and is counted in the
+    run summary. Untracked callers get every warning printed, uncapped."""
+    if tracker is None:
+        print(message)
+    else:
+        tracker.report(message)
+
+
+class _LazyBPlist:
+    """On-demand reader for a bplist00 buffer (normally a file's read-only
+    mmap; see _scan_plist), standing in for plistlib.load on large binary
+    plists.
+
+    plistlib materializes the whole object tree before _walk sees any of it,
+    so a 300 MB LaunchServices cache or Manifest.plist costs its full decoded
+    size in memory, and a long parse stall, up front. This reader only
+    validates the trailer; each object is then decoded from the buffer at
+    the moment _walk (or _context_snippet) reaches it, following the offset
+    table entry for its reference. Containers come back as _LazyDict /
+    _LazyArray views and nothing is kept once the walk moves on.
+
+    Data objects are the exception to "decode what is visited": a blob only
+    matters if it is an embedded plist (bytes never decode to a timestamp and
+    are left out of the Context column), so unless `keep_data` is set and the
+    blob passes the same header sniff as _looks_like_embedded_plist, it is
+    returned as b"" without being copied out of the map.
+
+    Scalars decode exactly as plistlib's _BinaryPlistParser decodes them, and
+    a _LazyDict iterates in the order (and with the last-wins duplicate-key
+    handling) of the dict plistlib would have built, so the records are the
+    same. The difference is *when* corruption is found: a malformed object
+    raises plistlib.InvalidFileException when it is reached, mid-walk, rather
+    than rejecting the file before anything is reported. _scan_plist turns
+    that into a truncation row, keeping whatever was decoded before it.
+    """
+
+    __slots__ = ("_buf", "_offset_size", "_ref_size", "_count", "_table",
+                 "_keep_data", "_top", "_offset", "_keys")
+
+    # Dict keys are decoded once per object ref and reused: a large plist is
+    # typically thousands of dicts sharing a handful of (uniqued) key strings.
+    MAX_CACHED_KEYS = 65536
+
+    def __init__(self, buf, keep_data=True):
+        trailer = _bplist_trailer(buf) if len(buf) >= 40 else None
+        if trailer is None or buf[:8] != BPLIST_MAGIC:
+            raise plistlib.InvalidFileException()
+        (self._offset_size, self._ref_size, self._count, self._top,
+         self._table) = trailer
+        self._buf = buf
+        self._keep_data = keep_data
+        fmt = _BPLIST_INT_FORMATS.get(self._offset_size)
+        self._offset = struct.Struct(">" + fmt).unpack_from if fmt else None
+        self._keys = {}
+
+    def root(self):
+        return self.object(self._top)
+
+    def key(self, ref):
+        """Decode dict key `ref` (data read in full: keys must be real,
+        hashable values), memoized."""
+        key = self._keys.get(ref)
+        if key is None:
+            key = self._object(ref, True)
+            if isinstance(key, (_LazyArray, _LazyDict)):
+                raise plistlib.InvalidFileException()  # unhashable in plistlib
+            if len(self._keys) < self.MAX_CACHED_KEYS:
+                self._keys[ref] = key
+        return key
+
+    def _ints(self, pos, n, size):
+        fmt = _BPLIST_INT_FORMATS.get(size)
+        if fmt is not None:
+            return struct.unpack_from(f">{n}{fmt}", self._buf, pos)
+        if not size or pos + size * n > len(self._buf):
+            raise plistlib.InvalidFileException()
+        buf = self._buf
+        return tuple(int.from_bytes(buf[i:i + size], "big")
+                     for i in range(pos, pos + size * n, size))
+
+    def refs(self, pos, n):
+        try:
+            return self._ints(pos, n, self._ref_size)
+        except struct.error:
+            raise plistlib.InvalidFileException()
+
+    def _size(self, token_low, pos):
+        """Object length and the position of its payload."""
+        if token_low != 0xF:
+            return token_low, pos
+        width = 1 << (self._buf[pos] & 0x3)
+        raw = self._buf[pos + 1:pos + 1 + width]
+        if len(raw) != width:
+            raise plistlib.InvalidFileException()
+        return int.from_bytes(raw, "big"), pos + 1 + width
+
+    def object(self, ref):
+        """Decode object `ref`."""
+        try:
+            return self._object(ref)
+        except _BPLIST_ERRORS:
+            raise plistlib.InvalidFileException()
+
+    def _object(self, ref, key=False):
+        # Raw decode: callers convert _BPLIST_ERRORS to InvalidFileException.
+        if ref >= self._count:
+            raise plistlib.InvalidFileException()
+        buf = self._buf
+        where = self._table + ref * self._offset_size
+        if self._offset is not None:
+            pos = self._offset(buf, where)[0]
+        else:
+            pos = self._ints(where, 1, self._offset_size)[0]
+        token = buf[pos]
+        high, low = token & 0xF0, token & 0x0F
+        pos += 1
+        if high == 0x50 or high == 0x60:
+            size, pos = self._size(low, pos)
+            if high == 0x60:
+                size *= 2
+            raw = buf[pos:pos + size]
+            if len(raw) != size:
+                raise plistlib.InvalidFileException()
+            return raw.decode("ascii" if high == 0x50 else "utf-16be")
+        if high == 0x10:
+            return int.from_bytes(buf[pos:pos + (1 << low)], "big", signed=low >= 3)
+        if high == 0xD0:
+            size, pos = self._size(low, pos)
+            return _LazyDict(self, pos, size)
+        if high == 0xA0:
+            size, pos = self._size(low, pos)
+            return _LazyArray(self, pos, size)
+        if token == 0x00:
+            return None
+        if token == 0x08:
+            return False
+        if token == 0x09:
+            return True
+        if token == 0x0F:
+            return b""
+        if token == 0x22:
+            return struct.unpack(">f", buf[pos:pos + 4])[0]
+        if token == 0x23:
+            return struct.unpack(">d", buf[pos:pos + 8])[0]
+        if token == 0x33:
+            # Same (naive, 2001-based) construction as plistlib, overflow
+            # and all, so interpret_value sees an identical datetime.
+            seconds = struct.unpack(">d", buf[pos:pos + 8])[0]
+            return datetime(2001, 1, 1) + timedelta(seconds=seconds)
+        if high == 0x40:
+            size, pos = self._size(low, pos)
+            if pos + size > len(buf):
+                raise plistlib.InvalidFileException()
+            if key or (self._keep_data and self._sniff(pos, pos + size)):
+                return buf[pos:pos + size]
+            return b""
+        if high == 0x80:
+            return plistlib.UID(int.from_bytes(buf[pos:pos + 1 + low], "big"))
+        raise plistlib.InvalidFileException()
+
+    def _sniff(self, start, end):
+        """Could the blob at buf[start:end] parse as an embedded plist (see
+        _embedded_plist_format)? Checked in place, so a blob that can't --
+        the common case -- is never copied out of the map."""
+        return _embedded_plist_format(self._buf, start, end) is not None
+
+
+_BPLIST_INT_FORMATS = {1: "B", 2: "H", 4: "L", 8: "Q"}
+# Everything plistlib's own parser maps to InvalidFileException.
+_BPLIST_ERRORS = (IndexError, struct.error, OverflowError, ValueError)
+# First byte bytes.lstrip() would keep, and first character str.lstrip()
+# would keep.
+_BPLIST_NON_WS = re.compile(rb"[^ \t\n\r\x0b\x0c]")
+_STR_NON_WS = re.compile(r"\S")
+
+
+class _LazyArray:
+    """A bplist array whose elements are decoded as they are iterated."""
+
+    __slots__ = ("_reader", "_pos", "_count")
+
+    def __init__(self, reader, pos, count):
+        self._reader = reader
+        self._pos = pos
+        self._count = count
+
+    def __iter__(self):
+        reader = self._reader
+        try:
+            for ref in reader.refs(self._pos, self._count):
+                yield reader._object(ref)
+        except _BPLIST_ERRORS:
+            raise plistlib.InvalidFileException()
+
+
+class _LazyDict:
+    """A bplist dict whose values are decoded as they are iterated. Keys are
+    decoded on first use into a key -> object-ref index; building it as a
+    dict gives plistlib's ordering and last-wins duplicate handling.
+
+    A small dict keeps its decoded items once walked: _context_snippet reads
+    every sibling again for each timestamp found in it, and a typical record
+    dict (a handful of keys) would otherwise be decoded once per timestamp.
+    """
+
+    __slots__ = ("_reader", "_pos", "_count", "_items")
+
+    # Largest dict whose decoded items are kept; see above.
+    MAX_KEPT_ITEMS = 64
+
+    def __init__(self, reader, pos, count):
+        self._reader = reader
+        self._pos = pos
+        self._count = count
+        self._items = None
+
+    def items(self):
+        if self._items is not None:
+            return iter(self._items)
+        reader = self._reader
+        try:
+            n = self._count
+            key_refs = reader.refs(self._pos, n)
+            value_refs = reader.refs(self._pos + n * reader._ref_size, n)
+            index = dict(zip(map(reader.key, key_refs), value_refs))
+        except _BPLIST_ERRORS:
+            raise plistlib.InvalidFileException()
+        if n <= self.MAX_KEPT_ITEMS:
+            self._items = list(self._decode(index))
+            return iter(self._items)
+        return self._decode(index)
+
+    def _decode(self, index):
+        reader = self._reader
+        try:
+            for k, v in index.items():
+                yield k, reader._object(v)
+        except _BPLIST_ERRORS:
+            raise plistlib.InvalidFileException()
+
+
+# _KeyPath step kinds.
+_PATH_KEY, _PATH_INDEX, _PATH_EMBEDDED = 0, 1, 2
+
+
+class _KeyPath:
+    """A node's key path ("root/items[3]/date"), kept as a link to its
+    parent's path plus one step and only rendered to text when something
+    asks for it.
+
+    _walk gives every node it visits a key path, but only the few leaves that
+    produce a Record (or carry an embedded plist) ever need one as a string;
+    formatting each one eagerly was most of the walk's string work. str()
+    renders the path once and keeps the text, so siblings that do produce
+    Records each add only their own step to their parent's text. Rendering
+    is a loop rather than recursion, like _walk itself, however deep the
+    path. `parent` may be a plain string: the root path ("" for a file, the
+    cell's path for a SQLite value).
+    """
+
+    __slots__ = ("_parent", "_kind", "_step", "_text")
+
+    def __init__(self, parent, kind, step=None):
+        self._parent = parent
+        self._kind = kind
+        self._step = step
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            chain = []
+            node = self
+            while isinstance(node, _KeyPath) and node._text is None:
+                chain.append(node)
+                node = node._parent
+            text = node._text if isinstance(node, _KeyPath) else node
+            parts = [text]
+            empty = not text
+            for node in reversed(chain):
+                if node._kind == _PATH_KEY:
+                    step = f"{node._step}"
+                    # A key directly under an empty path has no leading "/".
+                    parts.append(step if empty else f"/{step}")
+                    empty = empty and not step
+                elif node._kind == _PATH_INDEX:
+                    parts.append(f"[{node._step}]")
+                    empty = False
+                else:
+                    parts.append("→[embedded]")
+                    empty = False
+            self._text = "".join(parts)
+        return self._text
 
 
 def _walk(value, key, key_path, parent_dict, options, depth, records, budget=None):
-    """Recursively walk parsed plist data, collecting timestamp Records.
+    """Walk parsed plist data, collecting timestamp Records.
+
+    Depth-first, in document order, but with an explicit stack of child
+    iterators instead of one Python call per nesting level, so a deep (yet
+    legitimate) structure is walked in full rather than ending in a
+    RecursionError and a truncated source. `key_path` is a string or a
+    _KeyPath; child paths are _KeyPaths, rendered only when needed.
 
     `budget` (a _WalkBudget) bounds the total number of nodes visited across
     this whole top-level call -- see _WalkBudget for why this is necessary
-    even though _resolve_nskeyedarchiver's own results are memoized. Defaults
-    to a fresh (generous) budget when not supplied, so a caller that forgets
-    to thread one through still gets a bounded walk rather than an unbounded
-    one.
+    even though _resolve_nskeyedarchiver's own results are memoized. Every
+    node is charged once, in the same order the recursive walk charged it,
+    and a node refused by an exhausted budget is skipped along with its
+    subtree. Defaults to a fresh (generous) budget when not supplied, so a
+    caller that forgets to thread one through still gets a bounded walk
+    rather than an unbounded one.
     """
     if budget is None:
         budget = _WalkBudget("<unspecified source>")
     if not budget.consume():
         return
-    if isinstance(value, dict):
-        for k, v in value.items():
-            child = f"{key_path}/{k}" if key_path else k
-            _walk(v, k, child, value, options, depth, records, budget)
+    dicts = (dict, _LazyDict)
+    lists = (list, _LazyArray)
+    if isinstance(value, dicts):
+        frame = (iter(value.items()), value, key_path)
+    elif isinstance(value, lists):
+        frame = (enumerate(value), None, key_path)
+    else:
+        _process_leaf(value, key, key_path, parent_dict, options, depth, records, budget)
         return
-    if isinstance(value, list):
-        for i, item in enumerate(value):
-            child = f"{key_path}[{i}]"
-            _walk(item, None, child, None, options, depth, records, budget)
-        return
-    _process_leaf(value, key, key_path, parent_dict, options, depth, records, budget)
+    # Each frame: (iterator of (key or index, child), the dict itself or None
+    # for a list, the container's key path).
+    stack = [frame]
+    while stack:
+        children, parent, path = stack[-1]
+        for k, child in children:
+            if parent is not None:
+                child_key, child_path = k, _KeyPath(path, _PATH_KEY, k)
+            else:
+                child_key, child_path = None, _KeyPath(path, _PATH_INDEX, k)
+            if not budget.consume():
+                continue
+            if isinstance(child, dicts):
+                stack.append((iter(child.items()), child, child_path))
+                break
+            if isinstance(child, lists):
+                stack.append((enumerate(child), None, child_path))
+                break
+            _process_leaf(child, child_key, child_path, parent, options, depth,
+                          records, budget)
+        else:
+            stack.pop()
 
 
 def _process_leaf(value, key, key_path, parent_scalars, options, depth, records, budget=None):
@@ -957,21 +1905,85 @@ def _process_leaf(value, key, key_path, parent_scalars, options, depth, records,
     if budget is None:
         budget = _WalkBudget("<unspecified source>")
     # Embedded plist recursion (binary bplist blobs or inline-XML strings).
-    if not options.nonest and depth < options.nestdepth:
-        embedded = _try_embedded_plist(value)
-        if embedded is not None:
-            resolved = _resolve_nskeyedarchiver(embedded, budget=budget)
-            tree = resolved if resolved is not None else embedded
-            _walk(tree, key, f"{key_path}→[embedded]", None,
-                  options, depth + 1, records, budget)
-            return
+    if (not options.nonest and depth < options.nestdepth
+            and _walk_embedded(value, key, key_path, options, depth, records,
+                               budget)):
+        return
+
+    _append_candidates(value, key, key_path, parent_scalars, options,
+                       interpret_value(value, options.deepscan, options.decode_ctx),
+                       records)
+
 
-    candidates = interpret_value(value, options.deepscan)
+def _walk_embedded(value, key, key_path, options, depth, records, budget):
+    """Walk `value` into `records` if it is an embedded serialized plist, and
+    return True; return False (having recorded nothing) if it isn't one.
+
+    A repeat of content already decoded under the same key and depth
+    replays the stored Records under this copy's key path (see
+    _ContentDedup); a repeat seen once before is decoded and stored. Without
+    a shared DecodeContext (`options.decode_ctx` None) every copy is decoded.
+    """
+    found = _embedded_plist_bytes(value)
+    if found is None:
+        return False
+    data, fmt = found
+    path = _KeyPath(key_path, _PATH_EMBEDDED)
+    dedup = dedup_key = entry = None
+    if options.decode_ctx is not None:
+        dedup = options.decode_ctx.dedup
+        dedup_key = (dedup.digest(data), key, depth)
+        entry = dedup.lookup(dedup_key, "embedded", budget.remaining)
+    if entry is not None:
+        nodes, stored = entry
+        if stored is None:
+            return False
+        budget.remaining -= nodes
+        prefix = str(path)
+        for r in stored:
+            records.append(r._replace(key=prefix + r.key))
+        return True
+    try:
+        embedded = plistlib.loads(data, fmt=fmt)
+    except Exception:
+        if dedup is not None:
+            dedup.store(dedup_key, 0, None)
+        return False
+    # Collect a decode being stored separately, and hand its Records on
+    # even if the walk dies partway: partial evidence still belongs in the
+    # report.
+    out = [] if dedup is not None and dedup.admit(dedup_key) else records
+    remaining = budget.remaining
+    try:
+        resolved = _resolve_nskeyedarchiver(embedded, budget=budget)
+        tree = resolved if resolved is not None else embedded
+        _walk(tree, key, path, None, options, depth + 1, out, budget)
+    finally:
+        if out is not records:
+            for r in out:
+                records.append(r)
+    if out is not records and not budget.truncated:
+        start = len(str(path))
+        dedup.store(dedup_key, remaining - budget.remaining,
+                    tuple(r._replace(key=r.key[start:], context=str(r.context))
+                          for r in out))
+    return True
+
+
+def _append_candidates(value, key, key_path, parent_scalars, options,
+                       candidates, records):
+    """Turn a leaf's decoded Candidates into Records, applying the default-mode
+    noise filter. Split out of _process_leaf so callers that have already
+    decoded a value (the SQLite numeric fast path) don't decode it twice."""
     if not candidates:
         return
 
     key_is_date = bool(key and DATE_KEY_RE.search(key))
-    context = "" if options.nocontext else _context_snippet(parent_scalars, key)
+    if options.nocontext or parent_scalars is None:
+        context = ""
+    else:
+        context = _LazyContext(parent_scalars, key)
+    path = None
 
     for c in candidates:
         # In default (non-deepscan) mode keep the noise down: only accept values whose key
@@ -980,8 +1992,10 @@ def _process_leaf(value, key, key_path, parent_scalars, options, depth, records,
             key_is_date or c.fmt == "Plist_date" or c.confidence == "high"
         ):
             return
+        if path is None:
+            path = str(key_path)  # render a lazy _KeyPath only for a Record
         records.append(
-            Record(c.iso, _orig_str(value), c.fmt, key_path, c.confidence, context, c.dt)
+            Record(c.iso, _orig_str(value), c.fmt, path, c.confidence, context, c.dt)
         )
 
 
@@ -992,14 +2006,20 @@ def extract_records(plist_data, options, source="<data>", budget=None,
     defaults to a fresh, untracked budget otherwise, matching every other
     _WalkBudget default in this module.
 
-    `records` may likewise be a caller-owned list, which is appended to in
-    place. That lets a caller keep everything collected so far even when the
-    walk dies partway (RecursionError on a pathological graph) -- partial
-    evidence still belongs in the report."""
+    `records` may likewise be caller-owned: a list, or any object with an
+    `append` method (a _RecordSink streams each Record straight to the output
+    as it is decoded, so memory stays flat however large the source is). That
+    lets a caller keep everything collected so far even when the walk dies
+    partway (RecursionError on a pathological graph) -- partial evidence
+    still belongs in the report. A caller-owned `records` receives Records
+    whose context may still be a _LazyContext; the returned list always has
+    it rendered."""
     if budget is None:
         budget = _WalkBudget(source)
     if records is None:
         records = []
+        _walk(plist_data, None, "", None, options, 0, records, budget)
+        return [_render_context(r) for r in records]
     _walk(plist_data, None, "", None, options, 0, records, budget)
     return records
 
@@ -1008,16 +2028,30 @@ def extract_records(plist_data, options, source="<data>", budget=None,
 # File / directory processing
 # ---------------------------------------------------------------------------
 
+def _plist_type_from_header(header):
+    if header.startswith(b"bplist"):
+        return "bplist"
+    if header.startswith(b"<?xml"):
+        return "plist"
+    return "unknown"
+
+
+def _kind_from_header(header):
+    if header.startswith(b"bplist"):
+        return "bplist"
+    if header.startswith(b"SQLite format 3\x00"):
+        return "sqlite"
+    stripped = header.lstrip()
+    if stripped.startswith(b"<?xml") or stripped.startswith(b"<plist"):
+        return "plist"
+    return "unknown"
+
+
 def get_file_type(plist_path):
     """Determine if the file is a plist or a bplist."""
     try:
         with open(plist_path, "rb") as file:
-            header = file.read(8)
-            if header.startswith(b"bplist"):
-                return "bplist"
-            if header.startswith(b"<?xml"):
-                return "plist"
-            return "unknown"
+            return _plist_type_from_header(file.read(8))
     except Exception as e:
         print(f"Error determining file type: {e}")
         return "error"
@@ -1031,14 +2065,60 @@ def get_file_kind(path):
     except Exception as e:
         print(f"Error reading {path}: {e}")
         return "unknown"
-    if header.startswith(b"bplist"):
-        return "bplist"
-    if header.startswith(b"SQLite format 3\x00"):
-        return "sqlite"
-    stripped = header.lstrip()
-    if stripped.startswith(b"<?xml") or stripped.startswith(b"<plist"):
-        return "plist"
-    return "unknown"
+    return _kind_from_header(header)
+
+
+# Plists at least this large are memory-mapped instead of read into memory,
+# then walked without building the whole tree first (see _LazyBPlist and
+# _StreamingXMLPlist).
+MMAP_MIN_BYTES = 8 * 1024 * 1024
+
+
+class _SourceFile:
+    """A candidate file classified, and -- if it is a plist -- read, through
+    a single open (see _open_source).
+
+    `kind` is what get_file_kind would return and `file_type` what
+    get_file_type would; `data` is the whole file (bytes, or a read-only mmap
+    for large files) for plists, None otherwise. SQLite files are only
+    classified: sqlite3 opens them itself.
+    """
+
+    __slots__ = ("kind", "file_type", "data")
+
+    def __init__(self, kind, file_type=None, data=None):
+        self.kind = kind
+        self.file_type = file_type
+        self.data = data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data = None
+
+
+def _open_source(path):
+    """Classify `path` by its header and, for a plist, load its contents, all
+    from one open() -- on FUSE/network-mounted evidence every extra open is a
+    round trip. Files under MMAP_MIN_BYTES are read in full; larger ones are
+    memory-mapped so their pages are only faulted in as the parser reads."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(16)
+            kind = _kind_from_header(header)
+            if kind not in ("plist", "bplist"):
+                return _SourceFile(kind)
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = header + f.read()
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return _SourceFile("unknown")
+    return _SourceFile(kind, _plist_type_from_header(header), data)
 
 
 def build_headers(options):
@@ -1057,25 +2137,221 @@ def build_headers(options):
     return headers
 
 
-def _emit_records(records, file_type, source_path, csv_writer, options):
-    """Filter, validate, and write one TSV row per surviving Record."""
-    full_path = os.path.abspath(source_path)
-    file_name = os.path.basename(source_path)
-    for r in records:
-        if not options.date_filter.matches(r.dt):
-            continue
-        is_valid, reason = validate_timestamp(r.iso)
-        # --validate alone drops anything that fails validation; --deepscan shows all.
-        if options.validate and not options.deepscan and not is_valid:
-            continue
-        row = [r.iso, r.original, r.fmt, file_type, file_name, full_path, r.key]
+class _RecordSink:
+    """Stand-in for a source's `records` list that filters, validates and
+    writes each Record the moment it is appended.
+
+    Handed to extract_records/_process_leaf in place of a list, rows reach
+    the output as they are decoded instead of after the whole source has been
+    walked, so peak memory no longer grows with the size of the source. A
+    mid-walk RecursionError or database error still leaves every row decoded
+    before it in the output -- they were written already.
+    """
+
+    __slots__ = ("_writer", "_options", "_file_type", "_file_name", "_full_path")
+
+    def __init__(self, csv_writer, options, file_type, source_path):
+        self._writer = csv_writer
+        self._options = options
+        self._file_type = file_type
+        self._file_name = os.path.basename(source_path)
+        self._full_path = os.path.abspath(source_path)
+
+    def append(self, r):
+        options = self._options
+        reason = _filter_verdict(r, options)
+        if reason is None:
+            return
+        row = [r.iso, r.original, r.fmt, self._file_type, self._file_name,
+               self._full_path, r.key]
         if not options.nocontext:
-            row.append(r.context)
+            row.append(str(r.context))
         if options.deepscan:
             row += [r.confidence, reason]
         elif options.validate:
             row.append(reason)
-        csv_writer.writerow(row)
+        self._writer.writerow(row)
+
+    def extend(self, records):
+        for r in records:
+            self.append(r)
+
+
+def _filter_verdict(r, options):
+    """Record `r`'s validation reason if it survives the run's date-range
+    filter and --validate, or None if it is dropped."""
+    if not options.date_filter.matches(r.dt):
+        return None
+    is_valid, reason = validate_datetime(r.dt, ctx=options.decode_ctx)
+    # --validate alone drops anything that fails validation; --deepscan shows all.
+    if options.validate and not options.deepscan and not is_valid:
+        return None
+    return reason
+
+
+def _render_context(r):
+    """`r` with its context rendered to a string (see _LazyContext)."""
+    if isinstance(r.context, _LazyContext):
+        return r._replace(context=str(r.context))
+    return r
+
+
+class _SettledRecords:
+    """A worker's `records`: keeps each Record ready to send to the parent as
+    it is appended -- context rendered, and, unless the --cache needs every
+    Record, only if it survives the run's filters (the parent filters again
+    as it writes them, to the same result).
+
+    Rendering at append time, exactly when a serial run's _RecordSink would,
+    keeps a context from outliving its (possibly mapped) source, from
+    dragging its whole parent dict through the pipe, and from hitting a
+    malformed sibling outside _scan_plist's error handling.
+    """
+
+    __slots__ = ("items", "_options")
+
+    def __init__(self, options):
+        self.items = _RecordStore()
+        self._options = options
+
+    def append(self, r):
+        if self._options.cache_path or _filter_verdict(r, self._options) is not None:
+            self.items.append(_render_context(r))
+
+
+class _TextColumn:
+    """Append-only sequence of strings kept as a few large strings.
+
+    Every SEGMENT strings are joined into one, with their lengths in an
+    array; a Python str costs ~50 bytes before its first character, which on
+    short key paths and values is more than the text itself. Read back in
+    order by iteration only.
+    """
+
+    __slots__ = ("_segments", "_counts", "_lengths", "_pending")
+
+    SEGMENT = 1024
+
+    def __init__(self):
+        self._segments = []
+        self._counts = array("L")
+        self._lengths = array("L")
+        self._pending = []
+
+    def append(self, text):
+        self._pending.append(text)
+        if len(self._pending) >= self.SEGMENT:
+            self._seal()
+
+    def _seal(self):
+        if self._pending:
+            self._segments.append("".join(self._pending))
+            self._counts.append(len(self._pending))
+            self._lengths.extend(map(len, self._pending))
+            self._pending = []
+
+    def __iter__(self):
+        lengths = iter(self._lengths)
+        for segment, count in zip(self._segments, self._counts):
+            pos = 0
+            for _ in range(count):
+                end = pos + next(lengths)
+                yield segment[pos:end]
+                pos = end
+        yield from self._pending
+
+    def __getstate__(self):
+        self._seal()
+        return self._segments, self._counts, self._lengths
+
+    def __setstate__(self, state):
+        self._segments, self._counts, self._lengths = state
+        self._pending = []
+
+
+class _RecordStore:
+    """Compact, column-wise list of Records: what a worker sends back.
+
+    A Record costs several hundred bytes as a namedtuple -- an ISO string, a
+    datetime, and label strings repeated on every row -- and a worker holds
+    a whole source's (or a table chunk's) worth before pickling them all to
+    the parent. Here each Record is one int64 of epoch microseconds (the ISO
+    string and the datetime are both rebuilt from it, exactly as the --cache
+    does), one byte each for its enumerated format and confidence labels,
+    and its original value, key path and context in _TextColumns: a few
+    dozen bytes plus the text itself, in memory and on the pipe. A context
+    equal to the previous Record's -- every decoded cell of one SQLite row,
+    every timestamp of one dict -- is stored once, as a flag.
+
+    Contexts must already be rendered (see _SettledRecords). Iterating
+    yields equal Records, in order; it can be repeated.
+    """
+
+    __slots__ = ("_us", "_fmt", "_conf", "_labels", "_label_ids",
+                 "_original", "_key", "_context", "_same_context", "_last_context")
+
+    def __init__(self):
+        self._us = array("q")
+        self._fmt = array("B")
+        self._conf = array("B")
+        self._labels = []
+        self._label_ids = {}
+        self._original = _TextColumn()
+        self._key = _TextColumn()
+        self._context = _TextColumn()
+        self._same_context = array("B")
+        self._last_context = None
+
+    def _label_id(self, label):
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = self._label_ids[label] = len(self._labels)
+            self._labels.append(label)
+        return label_id
+
+    def append(self, r):
+        self._us.append(_dt_to_us(r.dt))
+        self._fmt.append(self._label_id(r.fmt))
+        self._conf.append(self._label_id(r.confidence))
+        self._original.append(r.original)
+        self._key.append(r.key)
+        if len(self._us) > 1 and r.context == self._last_context:
+            self._same_context.append(1)
+        else:
+            self._same_context.append(0)
+            self._context.append(r.context)
+            self._last_context = r.context
+
+    def __len__(self):
+        return len(self._us)
+
+    def __iter__(self):
+        labels = self._labels
+        contexts = iter(self._context)
+        context = None
+        for us, fmt, conf, original, key, same in zip(
+                self._us, self._fmt, self._conf,
+                self._original, self._key, self._same_context):
+            if not same:
+                context = next(contexts)
+            dt = _us_to_dt(us)
+            yield Record(dt.strftime(ISO_OUT), original, labels[fmt], key,
+                         labels[conf], context, dt)
+
+    def __getstate__(self):
+        return (self._us, self._fmt, self._conf, self._labels,
+                self._original, self._key, self._context, self._same_context)
+
+    def __setstate__(self, state):
+        (self._us, self._fmt, self._conf, self._labels,
+         self._original, self._key, self._context, self._same_context) = state
+        self._label_ids = {label: i for i, label in enumerate(self._labels)}
+        self._last_context = None
+
+
+def _emit_records(records, file_type, source_path, csv_writer, options):
+    """Filter, validate, and write one TSV row per surviving Record."""
+    _RecordSink(csv_writer, options, file_type, source_path).extend(records)
 
 
 def _emit_truncation_row(csv_writer, options, file_type, source_path, key_hint):
@@ -1105,142 +2381,1988 @@ def _emit_truncation_row(csv_writer, options, file_type, source_path, key_hint):
     csv_writer.writerow(row)
 
 
-def process_file(plist_path, csv_writer, options, tracker=None):
-    file_type = get_file_type(plist_path)
+def _emit_source(csv_writer, options, file_type, source_path, records,
+                 truncated_keys):
+    """Write one source's surviving Records, then one TRUNCATION_MARKER row per
+    entry in `truncated_keys` (see _emit_truncation_row)."""
+    _emit_records(records, file_type, source_path, csv_writer, options)
+    for key_hint in truncated_keys:
+        _emit_truncation_row(csv_writer, options, file_type, source_path, key_hint)
+
+
+# Rows an output writer buffers before handing them on as one batch.
+OUTPUT_BATCH_ROWS = 10_000
+# Rows per Parquet row group.
+PARQUET_ROW_GROUP_ROWS = 100_000
+# Table written by --format sqlite.
+SQLITE_OUTPUT_TABLE = "timestamps"
+
+
+class _OutputWriter:
+    """Base for the --format backends.
+
+    Everything that writes output -- _RecordSink, _emit_truncation_row and
+    the cache replay -- only ever calls `writerow(row)` with a list of
+    strings in build_headers order, so any object with that method (a plain
+    csv.writer included, for callers of process_file/process_sqlite_file)
+    can stand in. The backends buffer rows and write them in batches; the
+    output is complete once close() has run (process_directory uses each as
+    a context manager). TRUNCATION_MARKER rows are ordinary rows here and
+    reach every format; their empty "UTC Timestamp" becomes a null in the
+    typed ones.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Size of the chunks compressed output is handed to its background thread
+# in, and how many may wait for it before the scan blocks.
+COMPRESS_CHUNK_BYTES = 1 << 20
+COMPRESS_QUEUE_CHUNKS = 8
+
+# Output file suffix -> compression (see _compression_for).
+COMPRESSED_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+
+
+def _compression_for(path):
+    """"gzip", "zstd" or None, from `path`'s suffix."""
+    return COMPRESSED_SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+class _CompressingWriter(io.RawIOBase):
+    """Binary sink that compresses into a file on a background thread.
+
+    write() only queues a copy of the bytes; a thread compresses and writes
+    them, so on a large run compression overlaps the scan instead of adding
+    to it (zlib and zstd release the GIL while they work). It sits below a
+    COMPRESS_CHUNK_BYTES BufferedWriter, so the queue sees large chunks, and
+    the queue is bounded, so a slow disk throttles the scan rather than
+    letting chunks pile up in memory. An error on the thread (a full disk)
+    is raised from the next write() or from close().
+    """
+
+    def __init__(self, path, compression):
+        super().__init__()
+        # Opened here, not on the thread, so a bad path fails before the scan.
+        self._file = open(path, "wb")
+        self._queue = Queue(COMPRESS_QUEUE_CHUNKS)
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._run, args=(compression,), daemon=True,
+            name="output-compressor")
+        self._thread.start()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(bytes(data))
+        return len(data)
+
+    def _run(self, compression):
+        try:
+            with self._file as f:
+                if compression == "gzip":
+                    out = gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6)
+                else:
+                    out = zstandard.ZstdCompressor(level=3).stream_writer(f, closefd=False)
+                with out:
+                    while (chunk := self._queue.get()) is not None:
+                        out.write(chunk)
+        except BaseException as e:
+            self._error = e
+            # Keep draining so write() and close() never block on a full queue.
+            while self._queue.get() is not None:
+                pass
+
+    def close(self):
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+            super().close()
+            if self._error is not None:
+                raise self._error
+
+
+class _TSVOutput(_OutputWriter):
+    """Tab-separated text: one csv.writer.writerows() call per batch of rows
+    instead of a writerow() call per row, through a large file buffer. A
+    `path` ending in .gz or .zst is compressed as it is written (see
+    _CompressingWriter); the rows are the same."""
+
+    def __init__(self, path, headers):
+        compression = _compression_for(path)
+        if compression is None:
+            self._file = open(path, "w", newline="", encoding="utf-8",
+                              buffering=1 << 20)
+        else:
+            self._file = io.TextIOWrapper(
+                io.BufferedWriter(_CompressingWriter(path, compression),
+                                  COMPRESS_CHUNK_BYTES),
+                encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file, delimiter="\t")
+        self._writer.writerow(headers)
+        self._rows = []
+
+    def writerow(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= OUTPUT_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        self._writer.writerows(self._rows)
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        self._file.close()
+
+
+def _iso_to_us(iso):
+    """An ISO_OUT timestamp as integer microseconds since the Unix epoch, or
+    None for the empty timestamp of a TRUNCATION_MARKER row."""
+    if not iso:
+        return None
+    return _dt_to_us(datetime.fromisoformat(iso))
+
+
+class _ParquetOutput(_OutputWriter):
+    """Apache Parquet (needs pyarrow), for pandas/DuckDB/Arrow timelines.
+
+    "UTC Timestamp" is a typed timestamp[us, UTC] column, so it can be
+    range-queried and sorted without re-parsing; every other column is a
+    string, exactly as in the TSV. Rows are collected column-wise and written
+    one row group per PARQUET_ROW_GROUP_ROWS rows.
+    """
+
+    def __init__(self, path, headers):
+        self._schema = pa.schema([
+            pa.field(h, pa.timestamp("us", tz="UTC") if h == "UTC Timestamp"
+                     else pa.string())
+            for h in headers
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._columns = [[] for _ in headers]
+
+    def writerow(self, row):
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        if len(self._columns[0]) >= PARQUET_ROW_GROUP_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if not self._columns[0]:
+            return
+        self._columns[0] = [_iso_to_us(iso) for iso in self._columns[0]]
+        arrays = [pa.array(column, type=field.type)
+                  for column, field in zip(self._columns, self._schema)]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        self._columns = [[] for _ in self._columns]
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+class _SQLiteOutput(_OutputWriter):
+    """A SQLite database holding one SQLITE_OUTPUT_TABLE table, with the
+    build_headers columns (as TEXT) and indexes on "UTC Timestamp" and
+    "Full Path". ISO_OUT timestamps sort chronologically as text; an empty
+    one (a TRUNCATION_MARKER row) is stored as NULL.
+
+    An existing table of that name in the file is replaced, as the TSV file
+    would be; anything else in the database is left alone. The indexes are
+    built once, at close(), which is faster than maintaining them row by
+    row.
+    """
+
+    def __init__(self, path, headers):
+        self._conn = sqlite3.connect(path)
+        columns = ", ".join(f"{_quote_ident(h)} TEXT" for h in headers)
+        self._conn.executescript(f"""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            DROP TABLE IF EXISTS {SQLITE_OUTPUT_TABLE};
+            CREATE TABLE {SQLITE_OUTPUT_TABLE} ({columns});
+        """)
+        self._insert = (f"INSERT INTO {SQLITE_OUTPUT_TABLE} VALUES "
+                        f"({', '.join('?' * len(headers))})")
+        self._rows = []
+
+    def writerow(self, row):
+        if not row[0]:
+            row = [None] + row[1:]
+        self._rows.append(row)
+        if len(self._rows) >= OUTPUT_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        self._conn.executemany(self._insert, self._rows)
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        for column in ("UTC Timestamp", "Full Path"):
+            name = f"{SQLITE_OUTPUT_TABLE}_{column.lower().replace(' ', '_')}"
+            self._conn.execute(f"CREATE INDEX {name} ON {SQLITE_OUTPUT_TABLE} "
+                               f"({_quote_ident(column)})")
+        self._conn.commit()
+        self._conn.close()
+
+
+# --format name -> output writer class.
+OUTPUT_FORMATS = {
+    "tsv": _TSVOutput,
+    "parquet": _ParquetOutput,
+    "sqlite": _SQLiteOutput,
+}
+
+
+class _StopStream(Exception):
+    """Raised from inside an expat callback to end a streaming parse early."""
+
+
+class _XMLFrame:
+    """One open <dict>/<array> of a _StreamingXMLPlist.
+
+    For a dict, `parts` holds the "key=value" Context strings of its scalar
+    children seen so far, in document order. Parts are capped: each is cut to
+    CONTEXT_LIMIT + 1 characters and none are kept once their total passes
+    2 * CONTEXT_LIMIT + 4, which is still enough to build every sibling's
+    truncated snippet exactly (dropping any one key's part leaves more than
+    CONTEXT_LIMIT characters, so the snippet is cut at the same place). Past
+    the cap the dict is `settled`: no later child can change any snippet.
 
+    `waiting` holds the queued entries still needing a Context from the
+    dict, with the key each snippet leaves out.
+    """
+
+    __slots__ = ("is_dict", "path", "index", "parts", "size", "waiting")
+
+    def __init__(self, is_dict, path):
+        self.is_dict = is_dict
+        self.path = path
+        self.index = 0
+        self.parts = []
+        self.size = 0
+        self.waiting = []
+
+    @property
+    def settled(self):
+        return self.size > 2 * CONTEXT_LIMIT + 4
+
+    def add_part(self, key, value):
+        if self.settled:
+            return
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        part = f"{key}={value}"[:CONTEXT_LIMIT + 1]
+        self.parts.append((key, part))
+        self.size += len(part) + 2
+
+    def snippet(self, current_key):
+        """_context_snippet for the child `current_key`."""
+        snippet = "; ".join(part for k, part in self.parts if k != current_key)
+        if len(snippet) > CONTEXT_LIMIT:
+            snippet = snippet[: CONTEXT_LIMIT - 1] + "…"
+        return snippet
+
+
+# The XML elements whose values _StreamingXMLPlist leaves to plistlib's own
+# parser to decode. That parser is private API: when this Python's plistlib
+# doesn't have it, or lacks one of these handlers, large XML plists are
+# loaded whole with plistlib.load instead of streamed.
+_XML_SCALAR_ELEMENTS = ("true", "false", "integer", "real", "string", "data", "date")
+_PlistParserBase = getattr(plistlib, "_PlistParser", object)
+XML_STREAMING = all(callable(getattr(_PlistParserBase, "end_" + element, None))
+                    for element in _XML_SCALAR_ELEMENTS)
+
+# Headers plistlib.load recognizes as an XML plist, in each encoding it
+# accepts.
+_XML_PLIST_HEADERS = tuple(
+    bom + prefix.encode(encoding)
+    for bom, encoding in ((b"", "ascii"), (codecs.BOM_UTF8, "utf-8"),
+                          (codecs.BOM_UTF16_BE, "utf-16-be"),
+                          (codecs.BOM_UTF16_LE, "utf-16-le"),
+                          (codecs.BOM_UTF32_BE, "utf-32-be"),
+                          (codecs.BOM_UTF32_LE, "utf-32-le"))
+    for prefix in ("<?xml", "<plist")
+)
+
+
+# Records a _StreamingXMLPlist holds in memory behind one still waiting for
+# its Context before moving the queue to a temporary file (see _SpillQueue).
+XML_SPILL_ROWS = 10_000
+
+
+class _SpillQueue:
+    """The FIFO of [record, ready] entries a _StreamingXMLPlist writes out
+    in order, each once it and everything ahead of it are ready.
+
+    Up to `limit` entries are kept in memory. Past that the whole queue moves
+    to an anonymous temporary file, and later entries are appended there
+    until the file has been read back out, in pickled batches of
+    SPILL_BATCH. Ready records are stored as they are; an entry still waiting
+    leaves a sequence number, and once the caller has filled it in (see
+    resolve) its record goes to a second file, with only its position there
+    kept in memory. Memory is then bounded by `limit`, the entries still
+    waiting, a few batches, and eight bytes per spilled entry that was
+    waiting -- not by the number of records queued behind a waiting one.
+    """
+
+    SPILL_BATCH = 1024
+
+    def __init__(self, limit):
+        self._limit = limit
+        self._memory = deque()
+        self._file = self._side = None
+        self._reset()
+
+    def _reset(self):
+        self._batch = []          # spilled entries not yet written
+        self._loaded = deque()    # spilled entries read back, not yet drained
+        self._read_pos = 0
+        self._unread = 0
+        # Sequence number -> where its record is: -1 while the entry is still
+        # waiting, -2 - i for item i of _side_batch, else
+        # offset * SPILL_BATCH + i for item i of the batch at that offset of
+        # the side file.
+        self._positions = array("q")
+        self._side_batch = []
+        self._side_seqs = []
+        self._side_cache = (None, None)
+        self._blocked = None
+
+    def __bool__(self):
+        return bool(self._memory) or self._unread > 0
+
+    def append(self, entry):
+        if not self._unread:
+            if len(self._memory) < self._limit:
+                self._memory.append(entry)
+                return
+            if self._file is None:
+                self._file = tempfile.TemporaryFile()
+                self._side = tempfile.TemporaryFile()
+            for f in (self._file, self._side):
+                f.seek(0)
+                f.truncate()
+            self._reset()
+            while self._memory:
+                self._write(self._memory.popleft())
+        self._write(entry)
+
+    def _write(self, entry):
+        if entry[1]:
+            self._batch.append(_render_context(entry[0]))
+        else:
+            entry.append(len(self._positions))
+            self._positions.append(-1)
+            self._batch.append(entry[2])
+        self._unread += 1
+        if len(self._batch) >= self.SPILL_BATCH:
+            self._file.seek(0, os.SEEK_END)
+            pickle.dump(self._batch, self._file, pickle.HIGHEST_PROTOCOL)
+            self._batch = []
+
+    def resolve(self, entry):
+        """Note that `entry`, filled in and marked ready by the caller, can
+        be written out; a spilled one moves to the side file."""
+        if len(entry) <= 2:
+            return
+        seq = entry[2]
+        self._positions[seq] = -2 - len(self._side_batch)
+        self._side_batch.append(_render_context(entry[0]))
+        self._side_seqs.append(seq)
+        entry[0] = None
+        if len(self._side_batch) >= self.SPILL_BATCH:
+            side = self._side
+            side.seek(0, os.SEEK_END)
+            offset = side.tell()
+            pickle.dump(self._side_batch, side, pickle.HIGHEST_PROTOCOL)
+            for i, seq in enumerate(self._side_seqs):
+                self._positions[seq] = offset * self.SPILL_BATCH + i
+            self._side_batch = []
+            self._side_seqs = []
+
+    def _resolved(self, seq):
+        """The record of spilled entry `seq`, or None while it waits."""
+        position = self._positions[seq]
+        if position == -1:
+            return None
+        if position < 0:
+            return self._side_batch[-2 - position]
+        offset, i = divmod(position, self.SPILL_BATCH)
+        if self._side_cache[0] != offset:
+            self._side.seek(offset)
+            self._side_cache = (offset, pickle.load(self._side))
+        return self._side_cache[1][i]
+
+    def drain(self, records):
+        """Append every ready record at the head of the queue to
+        `records`."""
+        memory = self._memory
+        while memory and memory[0][1]:
+            records.append(memory.popleft()[0])
+        if not self._unread or (self._blocked is not None
+                                and self._positions[self._blocked] == -1):
+            return
+        self._blocked = None
+        loaded = self._loaded
+        while self._unread:
+            if not loaded:
+                f = self._file
+                if f.seek(0, os.SEEK_END) > self._read_pos:
+                    f.seek(self._read_pos)
+                    loaded.extend(pickle.load(f))
+                    self._read_pos = f.tell()
+                else:
+                    loaded.extend(self._batch)
+                    self._batch = []
+            item = loaded[0]
+            if isinstance(item, int):
+                record = self._resolved(item)
+                if record is None:
+                    self._blocked = item
+                    break
+                item = record
+            loaded.popleft()
+            records.append(item)
+            self._unread -= 1
+
+    def close(self):
+        for f in (self._file, self._side):
+            if f is not None:
+                f.close()
+        self._file = self._side = None
+
+
+class _StreamingXMLPlist(_PlistParserBase):
+    """Walks an XML plist straight from expat events, for files too large to
+    load into a tree first (an iTunes Library.xml, a sysdiagnose export).
+
+    plistlib's own parser supplies the decoding of scalar values (integers,
+    reals, dates, base64 data; see _XML_SCALAR_ELEMENTS); everything else --
+    the expat handlers, the container stack, key handling, entity rejection
+    -- is this class's own, and it never builds containers. Each
+    <dict>/<array> is an _XMLFrame carrying its key_path, and each scalar
+    goes through _process_leaf as soon as it is closed, charging the node
+    budget in the same order _walk would -- so the records are the ones
+    extract_records produces from the loaded tree, in the same order.
+
+    Context is the one thing a scalar can't have when it is reached: it
+    lists the siblings *after* it too. A record that needs one waits in a
+    FIFO until its dict is settled (see _XMLFrame) or closed, and everything
+    behind it in the FIFO waits with it to keep the output order -- for a
+    scalar of the root dict, possibly the rest of the file. The FIFO is a
+    _SpillQueue, so what waits is moved to a temporary file once it passes
+    XML_SPILL_ROWS records. Memory is therefore bounded by that, the records
+    still needing a Context on the open dicts (only the children each dict
+    gains before its Context parts pass the cap), and a capped list of parts
+    per open dict -- not by file size. With --nocontext nothing waits.
+
+    Two things plistlib silently discards can't be undone once streamed: a
+    value whose dict key is repeated later (plistlib keeps the last one, at
+    the first one's position), and all but the last of several top-level
+    objects. Here every such value is walked where it appears. Neither
+    occurs in plists written by Apple's serializers. Errors in the document are likewise only
+    found when reached; records before them are kept (see _scan_plist).
+    """
+
+    def __init__(self, plist_path, options, records, budget):
+        super().__init__(dict)
+        self.stack = []
+        self.current_key = None
+        self.data = []
+        self._path = plist_path
+        self._options = options
+        self._records = records
+        self._budget = budget
+        # None when there is no Context column: records are final at once.
+        self._queue = None if options.nocontext else _SpillQueue(XML_SPILL_ROWS)
+        self._exhausted = False
+
+    def parse(self, fileobj):
+        self.parser = ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.buffer_size = 1 << 20
+        self.parser.StartElementHandler = self.handle_begin_element
+        self.parser.EndElementHandler = self.handle_end_element
+        self.parser.CharacterDataHandler = self.handle_data
+        self.parser.EntityDeclHandler = self.handle_entity_decl
+        try:
+            self.parser.ParseFile(fileobj)
+        except _StopStream:
+            pass
+        except RecursionError:
+            raise
+        except Exception as e:
+            raise plistlib.InvalidFileException(str(e)) from e
+        finally:
+            # Release anything still pending (an error or recursion limit mid
+            # document), with the Context known so far.
+            for frame in self.stack:
+                self._settle(frame)
+            self.stack = []
+            if self._queue is not None:
+                self._queue.drain(self._records)
+                self._queue.close()
+
+    def handle_entity_decl(self, *args):
+        # Rejected like plistlib does, to keep expat's entity expansion out.
+        raise plistlib.InvalidFileException(
+            "XML entity declarations are not supported in plist files")
+
+    def handle_begin_element(self, element, attrs):
+        self.data = []
+        handler = getattr(self, "begin_" + element, None)
+        if handler is not None:
+            handler(attrs)
+
+    def handle_end_element(self, element):
+        handler = getattr(self, "end_" + element, None)
+        if handler is not None:
+            handler()
+
+    def handle_data(self, data):
+        self.data.append(data)
+
+    def get_data(self):
+        data = "".join(self.data)
+        self.data = []
+        return data
+
+    def _child(self):
+        """(key, key_path, parent frame) for the value being added,
+        validated the way plistlib's add_object validates it."""
+        if self.current_key is not None:
+            frame = self.stack[-1]
+            if not frame.is_dict:
+                raise ValueError("unexpected element at line %d" %
+                                 self.parser.CurrentLineNumber)
+            key = self.current_key
+            self.current_key = None
+            return key, (f"{frame.path}/{key}" if frame.path else key), frame
+        if not self.stack:
+            return None, "", None
+        frame = self.stack[-1]
+        if frame.is_dict:
+            raise ValueError("unexpected element at line %d" %
+                             self.parser.CurrentLineNumber)
+        path = f"{frame.path}[{frame.index}]"
+        frame.index += 1
+        return None, path, frame
+
+    def _visit(self):
+        """Charge one node to the budget, like _walk. Once it is spent no
+        further values are processed; parsing goes on only while records
+        are still waiting for a dict to settle."""
+        if self._exhausted or not self._budget.consume():
+            self._exhausted = True
+            if not self._queue:
+                raise _StopStream()
+            return False
+        return True
+
+    def add_object(self, value):
+        key, path, frame = self._child()
+        in_dict = frame is not None and frame.is_dict
+        if self._queue is not None and in_dict and not isinstance(value, bytes):
+            frame.add_part(key, value)
+            if frame.waiting and frame.settled:
+                self._settle(frame)
+        if not self._visit():
+            return
+        if self._queue is None:
+            _process_leaf(value, key, path, None, self._options, 0,
+                          self._records, self._budget)
+            return
+        produced = []
+        _process_leaf(value, key, path, None, self._options, 0, produced,
+                      self._budget)
+        for r in produced:
+            # Records from an embedded plist carry their own Context; only
+            # this value's own records take it from the enclosing dict.
+            if not in_dict or r.key != path:
+                entry = [r, True]
+            elif frame.settled:
+                entry = [r._replace(context=frame.snippet(key)), True]
+            else:
+                entry = [r, False]
+                frame.waiting.append((entry, key))
+            self._queue.append(entry)
+        self._release()
+
+    def _open(self, is_dict):
+        key, path, frame = self._child()
+        self._visit()
+        self.stack.append(_XMLFrame(is_dict, path))
+
+    def _settle(self, frame):
+        """Give every record waiting on `frame` its Context."""
+        for entry, key in frame.waiting:
+            entry[0] = entry[0]._replace(context=frame.snippet(key))
+            entry[1] = True
+            self._queue.resolve(entry)
+        frame.waiting = []
+
+    def _release(self):
+        """Write out what is ready, then stop the parse if the budget is
+        spent and nothing is left waiting."""
+        if self._queue is not None:
+            self._queue.drain(self._records)
+        if self._exhausted and not self._queue:
+            raise _StopStream()
+
+    def begin_dict(self, attrs):
+        self._open(True)
+
+    def end_dict(self):
+        if self.current_key:
+            raise ValueError("missing value for key '%s' at line %d" %
+                             (self.current_key, self.parser.CurrentLineNumber))
+        self._settle(self.stack.pop())
+        self._release()
+
+    def begin_array(self, attrs):
+        self._open(False)
+
+    def end_array(self):
+        self.stack.pop()
+        self._release()
+
+    def end_key(self):
+        if self.current_key or not self.stack or not self.stack[-1].is_dict:
+            raise ValueError("unexpected key at line %d" %
+                             self.parser.CurrentLineNumber)
+        self.current_key = self.get_data()
+
+
+def _scan_plist(plist_path, options, records, tracker=None, data=None):
+    """Decode one plist file into `records` (a caller-owned list or
+    _RecordSink, appended in place). `data` is the file's contents when the
+    caller already has them (see _open_source); otherwise the file is read.
+
+    Returns the list of truncation hints for the file, or None if it isn't a
+    parseable plist -- in which case nothing is reported for it at all.
+
+    A file read into memory (a small one; see MMAP_MIN_BYTES) whose exact
+    bytes were already decoded this run replays that decode (see
+    _ContentDedup), given a shared DecodeContext in `options.decode_ctx`.
+    """
+    dedup_key = None
+    if isinstance(data, bytes) and options.decode_ctx is not None:
+        dedup = options.decode_ctx.dedup
+        dedup_key = dedup.digest(data)
+        entry = dedup.lookup(dedup_key, "file")
+        if entry is not None:
+            if entry[1] is None:
+                return None
+            for r in entry[1]:
+                records.append(r)
+            return []
+    stream = False
     try:
-        with open(plist_path, "rb") as plist_file:
-            plist_data = plistlib.load(plist_file)
+        if data is None:
+            with open(plist_path, "rb") as plist_file:
+                plist_data = plistlib.load(plist_file)
+        elif (isinstance(data, mmap.mmap) and XML_STREAMING
+              and data[:32].startswith(_XML_PLIST_HEADERS)):
+            # Mapped (large) XML plists are parsed and walked in one streaming
+            # pass below; see _StreamingXMLPlist.
+            stream = True
+        elif isinstance(data, mmap.mmap) and data[:8] == b"bplist00":
+            # Mapped (large) binary plists are walked lazily; see _LazyBPlist.
+            keep_data = not options.nonest and options.nestdepth > 0
+            plist_data = _LazyBPlist(data, keep_data).root()
+        elif isinstance(data, mmap.mmap):
+            data.seek(0)
+            plist_data = plistlib.load(data)
+        else:
+            plist_data = plistlib.loads(data)
     except (plistlib.InvalidFileException, ValueError):
-        return
+        if dedup_key is not None:
+            dedup.store(dedup_key, 0, None)
+        return None
     except Exception as e:
         print(f"Skipping unreadable file {plist_path}: {e}")
-        return
+        return None
 
     budget = _WalkBudget(plist_path, tracker=tracker)
     # A pathological object graph can still nest deeply enough to exhaust the
     # interpreter stack. Catch it per source: one crafted file must never abort
     # the directory walk and silently leave later evidence unscanned.
     recursion_hit = False
-    # Caller-owned list so anything collected before a mid-walk RecursionError
-    # is still reported rather than discarded.
-    records = []
+    malformed = False
+    # `records` is caller-owned so anything collected before a mid-walk
+    # RecursionError is still reported rather than discarded; a decode kept
+    # for the dedup cache is collected separately and handed on regardless.
+    out = records
+    if dedup_key is not None and dedup.admit(dedup_key):
+        out = []
     try:
-        extract_records(plist_data, options, source=plist_path, budget=budget,
-                        records=records)
+        if stream:
+            data.seek(0)
+            _StreamingXMLPlist(plist_path, options, records, budget).parse(data)
+        else:
+            extract_records(plist_data, options, source=plist_path, budget=budget,
+                            records=out)
     except RecursionError:
         recursion_hit = True
         # Route through the tracker so this shares the run-wide warning cap and
         # is counted in the run summary, exactly like a budget truncation.
-        if tracker is None or tracker.note_truncated():
-            print(f"Recursion limit hit while walking {plist_path} -- "
-                  f"output for this source is truncated.")
-    _emit_records(records, file_type, plist_path, csv_writer, options)
-    if budget.truncated or recursion_hit:
-        hint = ("<truncated: recursion limit exceeded>" if recursion_hit
-                else "<truncated: node-visit budget exceeded>")
-        _emit_truncation_row(csv_writer, options, file_type, plist_path, hint)
+        _report_truncation(tracker, f"Recursion limit hit while walking {plist_path} -- "
+                                    f"output for this source is truncated.")
+    except plistlib.InvalidFileException:
+        # Only a lazily-read bplist or a streamed XML plist can fail here, on
+        # corruption the walk reached; everything decoded before it is kept.
+        malformed = True
+        _report_truncation(tracker, f"Malformed object found while walking {plist_path} -- "
+                                    f"output for this source is truncated.")
+    finally:
+        if out is not records:
+            for r in out:
+                records.append(r)
+    truncated_keys = []
+    if recursion_hit:
+        truncated_keys.append("<truncated: recursion limit exceeded>")
+    elif malformed:
+        truncated_keys.append("<truncated: malformed XML plist>" if stream
+                              else "<truncated: malformed binary plist>")
+    elif budget.truncated:
+        truncated_keys.append("<truncated: node-visit budget exceeded>")
+    elif out is not records:
+        dedup.store(dedup_key, 0, tuple(_render_context(r) for r in out))
+    return truncated_keys
+
+
+def process_file(plist_path, csv_writer, options, tracker=None, source=None):
+    """`source` is the file's _SourceFile when the caller already opened it."""
+    if source is None:
+        file_type, data = get_file_type(plist_path), None
+    else:
+        file_type, data = source.file_type, source.data
+    sink = _RecordSink(csv_writer, options, file_type, plist_path)
+    truncated_keys = _scan_plist(plist_path, options, sink, tracker, data)
+    if truncated_keys is None:
+        return
+    for key_hint in truncated_keys:
+        _emit_truncation_row(csv_writer, options, file_type, plist_path, key_hint)
     print(f"Evaluating: {plist_path}")
 
 
-def process_sqlite_file(db_path, csv_writer, options, tracker=None):
-    """Scan a SQLite database read-only for timestamps in columns and embedded plists."""
+def _connect_sqlite(db_path):
+    """Open `db_path` read-only and immutable: the tool never modifies a
+    scanned database."""
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro&immutable=1"
+    conn = sqlite3.connect(uri, uri=True)
+    # Decode TEXT leniently; BLOBs still arrive as bytes.
+    conn.text_factory = lambda b: b.decode("utf-8", "replace")
+    return conn
+
+
+def _list_tables(cur):
+    cur.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' "
+        "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'"
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def _quote_ident(name):
+    # Double-quoted identifier with embedded double quotes escaped by doubling.
+    # Without this, a table literally named e.g. foo"bar breaks the f-string
+    # quoting, the query raises, and the whole table is silently skipped
+    # (missed evidence) -- rather than just having its name escaped correctly.
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _column_affinity(declared_type):
+    """SQLite's type-affinity rules (sqlite.org/datatype3.html, 3.1) applied
+    to a column's declared type."""
+    t = (declared_type or "").upper()
+    if "INT" in t:
+        return "INTEGER"
+    if "CHAR" in t or "CLOB" in t or "TEXT" in t:
+        return "TEXT"
+    if not t or "BLOB" in t:
+        return "BLOB"
+    if "REAL" in t or "FLOA" in t or "DOUB" in t:
+        return "REAL"
+    return "NUMERIC"
+
+
+def _can_yield_records(value, options):
+    """Would this sampled cell produce a Record (or an embedded-plist walk)?"""
+    if (not options.nonest and options.nestdepth > 0
+            and _looks_like_embedded_plist(value)):
+        return True
+    return any(c.fmt == "Plist_date" or c.confidence == "high"
+               for c in interpret_value(value, options.deepscan, options.decode_ctx))
+
+
+def _plan_columns(cur, db_path, table, quoted, cols, declared_types, options,
+                  log):
+    """Decide which of a table's columns a default-mode scan can skip.
+
+    Opt-in: with `options.sample_rows` at 0 (the default) or --deepscan every
+    column is scanned. Otherwise samples the table's first
+    `options.sample_rows` rows, and a column is skipped
+    only when its declared type has TEXT or BLOB affinity (message bodies,
+    GUIDs, thumbnails), its name doesn't look temporal, and every non-NULL
+    sampled value is inert: nothing decodes to a reportable timestamp and
+    nothing looks like an embedded plist. Numeric-affinity columns -- where
+    Unix/Cocoa timestamps actually live -- are always scanned, and their
+    numeric cells take a cheap decode-only path in _scan_table anyway.
+
+    This trades recall for speed: a skipped column that holds a timestamp
+    further down the table is missed. A table no longer than the sample is
+    classified exactly, which is why sampling is never the default.
+    Returns one bool per column, True meaning skip; prints the decision per
+    column when `log` is set.
+    """
+    skipped = [False] * len(cols)
+    if options.deepscan or options.sample_rows <= 0:
+        return skipped
     try:
-        uri = Path(db_path).resolve().as_uri() + "?mode=ro&immutable=1"
-        conn = sqlite3.connect(uri, uri=True)
-    except Exception as e:
-        print(f"Skipping unreadable database {db_path}: {e}")
+        cur.execute(f"SELECT * FROM {quoted} LIMIT {int(options.sample_rows)}")
+        sample = cur.fetchall()
+    except sqlite3.DatabaseError:
+        return skipped
+    lines = []
+    for i, (col, declared) in enumerate(zip(cols, declared_types)):
+        affinity = _column_affinity(declared)
+        values = [row[i] for row in sample if row[i] is not None]
+        if affinity not in ("TEXT", "BLOB"):
+            decision = "scan (numeric affinity)"
+        elif DATE_KEY_RE.search(col):
+            decision = "scan (temporal column name)"
+        elif not values:
+            decision = "scan (no non-NULL sampled values)"
+        elif any(_can_yield_records(v, options) for v in values):
+            decision = "scan"
+        else:
+            skipped[i] = True
+            decision = f"skip ({len(values)} sampled values, none decodable)"
+        lines.append(f"  {table}.{col} [{declared or 'no type'}]: {decision}")
+    if log:
+        print(f"Column plan for {db_path}:{table} "
+              f"(first {len(sample)} row(s) sampled):")
+        print("\n".join(lines))
+    return skipped
+
+
+def _numeric_windows(date_filter):
+    """Merged, sorted [lo, hi] raw-value windows covering every number that
+    could decode (in any UNIT_RANGE unit) to a time inside `date_filter`.
+
+    Each window is padded by a second of its unit and the UNIT_RANGE gates by
+    a relative 1e-12, so float rounding -- ours, _epoch_to_dt's, or SQLite's
+    integer/real comparison -- can only ever let an extra row through, never
+    drop one that would have matched.
+    """
+    start = date_filter.start.timestamp() - 1 if date_filter.start else None
+    end = date_filter.end.timestamp() + 1 if date_filter.end else None
+    windows = []
+    for unit, (lo, hi) in UNIT_RANGE.items():
+        epoch, ticks = UNIT_SCALE[unit]
+        lo, hi = lo * (1 - 1e-12), hi * (1 + 1e-12)
+        if start is not None:
+            lo = max(lo, (start - epoch) * ticks)
+        if end is not None:
+            hi = min(hi, (end - epoch) * ticks)
+        if lo <= hi:
+            windows.append([lo, hi])
+    windows.sort()
+    merged = []
+    for lo, hi in windows:
+        if merged and lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return merged
+
+
+def _pushdown_clause(cols, skipped, options):
+    """SQL condition keeping only rows that can yield a Record under the
+    active date-range filter, or None when there is nothing to push down.
+
+    A number only matters if it falls in one of the _numeric_windows. TEXT
+    and BLOB cells (ISO strings, numeric strings, embedded plists) can't be
+    judged in SQL, so a row holding one in any scanned column is always kept.
+    """
+    # A cache must hold every Record, whatever this run happens to filter on.
+    if not options.date_filter.active or options.cache_path:
+        return None
+    windows = " OR ".join(f"{{c}} BETWEEN {lo!r} AND {hi!r}"
+                          for lo, hi in _numeric_windows(options.date_filter))
+    terms = []
+    for col, skip in zip(cols, skipped):
+        if skip:
+            continue
+        c = _quote_ident(col)
+        term = f"typeof({c}) IN ('text','blob')"
+        if windows:
+            term += " OR " + windows.format(c=c)
+        terms.append(f"({term})")
+    return " OR ".join(terms) if terms else "0"
+
+
+def _scan_table(cur, db_path, table, rowid_range, options, records, tracker,
+                truncated_keys):
+    """Decode every row of one table (or, with `rowid_range` = (lo, hi), only
+    rows with lo <= rowid <= hi) into `records`.
+
+    A table that can't be introspected or queried is skipped; a
+    sqlite3.DatabaseError raised while iterating its rows propagates so the
+    caller abandons the database, exactly as for a whole-database scan.
+    """
+    quoted = _quote_ident(table)
+    try:
+        cur.execute(f'PRAGMA table_info({quoted})')
+        info = cur.fetchall()
+        # Only the first rowid-range task of a split table logs its column
+        # plan, so --verbose output doesn't depend on --workers.
+        log = options.verbose
+        if log and rowid_range is not None:
+            cur.execute(f"SELECT min(rowid) FROM {quoted}")
+            log = rowid_range[0] <= cur.fetchone()[0]
+    except sqlite3.DatabaseError:
         return
+    cols = [r[1] for r in info]
+    skipped = _plan_columns(cur, db_path, table, quoted, cols,
+                            [r[2] for r in info], options, log)
+
+    # Filter rows in SQL where possible. Only on the rowid query: a WITHOUT
+    # ROWID table numbers its rows by scan position, which filtering would
+    # shift.
+    conditions = []
+    if rowid_range is not None:
+        conditions.append(f"rowid BETWEEN {int(rowid_range[0])} AND {int(rowid_range[1])}")
+    pushdown = _pushdown_clause(cols, skipped, options)
+    if pushdown is not None:
+        conditions.append(f"({pushdown})")
+        if log:
+            print(f"  pushdown: {pushdown}")
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    has_rowid = True
+    cur_sql = f'SELECT rowid, * FROM {quoted}{where}'
+    try:
+        cur.execute(cur_sql)
+    except sqlite3.DatabaseError:
+        has_rowid = False
+        cur_sql = f'SELECT * FROM {quoted}'
+        try:
+            cur.execute(cur_sql)
+        except sqlite3.DatabaseError:
+            return
 
-    # Decode TEXT leniently; BLOBs still arrive as bytes.
-    conn.text_factory = lambda b: b.decode("utf-8", "replace")
-    records = []
-    truncated_keys = []
+    # Stream in batches rather than fetchall(): real forensic databases can be
+    # hundreds of MB to GB, and materializing an entire table in memory risks
+    # OOM. Each batch's numeric cells are decoded column by column first (see
+    # _decode_numeric_columns).
+    first = 1 if has_rowid else 0
+    batch_rows = options.sqlite_fetch_rows
+    cur.arraysize = batch_rows
+    scanned_cols = skipped.count(False)
+    idx = 0
+    started = time.perf_counter()
     try:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' "
-            "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'"
-        )
-        tables = [row[0] for row in cur.fetchall()]
-
-        for table in tables:
-            # Double-quoted identifier with embedded double quotes escaped by doubling.
-            # Without this, a table literally named e.g. foo"bar breaks the f-string
-            # quoting, the query raises, and the whole table is silently skipped
-            # (missed evidence) -- rather than just having its name escaped correctly.
-            quoted = '"' + table.replace('"', '""') + '"'
+        while True:
+            error = None
             try:
-                cur.execute(f'PRAGMA table_info({quoted})')
-                cols = [r[1] for r in cur.fetchall()]
-            except sqlite3.DatabaseError:
-                continue
+                batch = cur.fetchmany()
+            except sqlite3.DatabaseError as e:
+                # fetchmany() drops the rows it had already read when it hits
+                # a corrupt page; read them again one at a time so they are
+                # still scanned, as they would be by a row-by-row scan, before
+                # the error ends the database.
+                batch = _refetch_rows(cur.connection, cur_sql, idx, batch_rows)
+                error = e
+            decoded = _decode_numeric_columns(batch, first, skipped, options)
+            for row_no, row in enumerate(batch):
+                rid = row[0] if has_rowid else idx
+                idx += 1
+                _scan_row(db_path, table, cols, row[first:], rid, skipped,
+                          decoded, row_no, options, records, tracker,
+                          truncated_keys)
+            if error is not None:
+                raise error
+            if len(batch) < batch_rows:
+                break
+    finally:
+        if options.decode_ctx is not None:
+            options.decode_ctx.table_stats.add(db_path, table, idx,
+                                               idx * scanned_cols,
+                                               time.perf_counter() - started)
+
+
+def _refetch_rows(conn, sql, offset, limit):
+    """Up to `limit` rows of `sql` from row `offset` on, read one at a time
+    and stopping quietly at the first error: the rows of a batch that
+    fetchmany() lost to a corrupt page. Re-running the query on an
+    unchanging, immutable database returns its rows in the same order."""
+    rows = []
+    try:
+        for row in conn.execute(f"{sql} LIMIT {int(limit)} OFFSET {int(offset)}"):
+            rows.append(row)
+    except sqlite3.DatabaseError:
+        pass
+    return rows
 
-            has_rowid = True
-            try:
-                cur.execute(f'SELECT rowid, * FROM {quoted}')
-            except sqlite3.DatabaseError:
-                has_rowid = False
-                try:
-                    cur.execute(f'SELECT * FROM {quoted}')
-                except sqlite3.DatabaseError:
-                    continue
 
-            # Stream row-by-row (iterate the cursor) rather than fetchall(): real
-            # forensic databases can be hundreds of MB to GB, and materializing an
-            # entire table in memory risks OOM.
-            for idx, row in enumerate(cur):
-                if has_rowid:
-                    rid, values = row[0], row[1:]
-                else:
-                    rid, values = idx, row
-                parent = dict(zip(cols, values))
-                for col, val in zip(cols, values):
-                    if val is None:
-                        continue
-                    key_path = f"{table}.{col}(rowid={rid})"
-                    # Fresh budget per cell (not shared across the whole table/
-                    # database): see _WalkBudget -- a large but legitimate scan
-                    # of many independent rows/columns must never accumulate
-                    # toward truncating later, unrelated output. `tracker` is
-                    # shared (run-scoped) purely for warning-cap/summary
-                    # purposes -- see _TruncationTracker.
-                    budget = _WalkBudget(f"{db_path}:{key_path}", tracker=tracker)
-                    # Catch RecursionError per cell: one crafted BLOB must never
-                    # abort the scan and silently leave later evidence unscanned.
-                    try:
-                        _process_leaf(val, col, key_path, parent, options, 0,
-                                      records, budget)
-                    except RecursionError:
-                        # Route through the tracker so this shares the run-wide
-                        # warning cap and is counted in the run summary.
-                        if tracker is None or tracker.note_truncated():
-                            print(f"Recursion limit hit while walking "
-                                  f"{db_path}:{key_path} -- output for this "
-                                  f"cell is truncated.")
-                        truncated_keys.append(key_path)
-                        continue
-                    if budget.truncated:
-                        truncated_keys.append(key_path)
+# Default for --sqlite-fetch-rows: rows read from a table per fetchmany()
+# batch, and so the batch size for interpret_numeric_batch.
+SQLITE_FETCH_ROWS = 1024
+
+# Tables listed by --stats, slowest first.
+STATS_TOP_TABLES = 20
+
+
+class _TableStats:
+    """Rows, cells and seconds spent per SQLite table, for --stats.
+
+    A table split across --workers tasks adds up its chunks, so its rate is
+    rows per second of scanning time, whichever worker did it. Cells are the
+    table's scanned (not skipped) columns times its rows.
+    """
+
+    __slots__ = ("_tables",)
+
+    def __init__(self):
+        self._tables = {}
+
+    def add(self, db_path, table, rows, cells, seconds):
+        entry = self._tables.setdefault((db_path, table), [0, 0, 0.0])
+        entry[0] += rows
+        entry[1] += cells
+        entry[2] += seconds
+
+    def take(self):
+        """The counts since the last call, then zero them; how a worker hands
+        its share back to the parent."""
+        tables, self._tables = self._tables, {}
+        return tables
+
+    def merge(self, tables):
+        for (db_path, table), (rows, cells, seconds) in tables.items():
+            self.add(db_path, table, rows, cells, seconds)
+
+    def summary(self, top=STATS_TOP_TABLES):
+        """Report for --stats, slowest tables first; "" if no table was
+        scanned."""
+        if not self._tables:
+            return ""
+        ranked = sorted(self._tables.items(), key=lambda kv: -kv[1][2])
+        lines = [f"SQLite tables: {len(ranked)} scanned, slowest first:"]
+        for (db_path, table), (rows, cells, seconds) in ranked[:top]:
+            rate = f"{rows / seconds:,.0f} rows/s, {cells / seconds:,.0f} cells/s" \
+                if seconds > 0 else "n/a"
+            lines.append(f"  {db_path}:{table}: {rows} row(s), {cells} cell(s) "
+                         f"in {seconds:.3f}s ({rate})")
+        if len(ranked) > top:
+            lines.append(f"  ... and {len(ranked) - top} more")
+        return "\n".join(lines)
+
+
+def _decode_numeric_columns(chunk, first, skipped, options):
+    """Batch-decode the int/float cells of a chunk of rows, column by column
+    (see interpret_numeric_batch). Returns one entry per column: None when
+    the column is skipped or has no numeric cells, otherwise a list aligned
+    with `chunk` holding each cell's Candidates (None for no candidates or a
+    non-numeric cell). Returns None altogether without NumPy, and _scan_row
+    then decodes cell by cell."""
+    if np is None:
+        return None
+    decoded = []
+    for j, skip in enumerate(skipped):
+        if skip:
+            decoded.append(None)
+            continue
+        pos = first + j
+        rows, values = [], []
+        for i, row in enumerate(chunk):
+            val = row[pos]
+            if type(val) in (int, float):
+                rows.append(i)
+                values.append(val)
+        if not values:
+            decoded.append(None)
+            continue
+        column = [None] * len(chunk)
+        batch = interpret_numeric_batch(values, options.deepscan, options.decode_ctx)
+        for i, candidates in zip(rows, batch):
+            column[i] = candidates
+        decoded.append(column)
+    return decoded
+
+
+class _RowScalars:
+    """A row's column values as the `parent_scalars` of its cells: just the
+    two sequences, read (by _context_snippet, through items()) only when a
+    Record's context is rendered. Building a dict per row for a 100-column
+    Core Data table cost more than decoding most of its cells."""
+
+    __slots__ = ("_cols", "_values")
+
+    def __init__(self, cols, values):
+        self._cols = cols
+        self._values = values
+
+    def items(self):
+        return zip(self._cols, self._values)
+
+
+def _scan_row(db_path, table, cols, values, rid, skipped, decoded, row_no,
+              options, records, tracker, truncated_keys):
+    """Decode one row's cells, in column order, into `records`. `decoded` is
+    its batch's _decode_numeric_columns result and `row_no` its index there.
+
+    A cell's key path is only formatted for a cell that decodes; only one
+    that looks like an embedded plist takes _process_leaf's path, with its
+    own walk budget. Every other cell is exactly _process_leaf's fallback.
+    """
+    parent = _RowScalars(cols, values)
+    nest = not options.nonest and options.nestdepth > 0
+    for j, (col, val, skip) in enumerate(zip(cols, values, skipped)):
+        if val is None or skip:
+            continue
+        if decoded is not None and type(val) in (int, float):
+            candidates = decoded[j][row_no]
+        elif nest and _looks_like_embedded_plist(val):
+            _scan_embedded_cell(db_path, f"{table}.{col}(rowid={rid})", col, val,
+                                parent, options, records, tracker,
+                                truncated_keys)
+            continue
+        else:
+            candidates = interpret_value(val, options.deepscan, options.decode_ctx)
+        if candidates:
+            _append_candidates(val, col, f"{table}.{col}(rowid={rid})",
+                               parent, options, candidates, records)
+
+
+def _scan_embedded_cell(db_path, key_path, col, val, parent, options, records,
+                        tracker, truncated_keys):
+    """Decode one cell that may hold an embedded plist, via _process_leaf."""
+    # Fresh budget per cell (not shared across the whole table/
+    # database): see _WalkBudget -- a large but legitimate scan
+    # of many independent rows/columns must never accumulate
+    # toward truncating later, unrelated output. `tracker` is
+    # shared (run-scoped) purely for warning-cap/summary
+    # purposes -- see _TruncationTracker.
+    budget = _WalkBudget(f"{db_path}:{key_path}", tracker=tracker)
+    # Catch RecursionError per cell: one crafted BLOB must never
+    # abort the scan and silently leave later evidence unscanned.
+    try:
+        _process_leaf(val, col, key_path, parent, options, 0,
+                      records, budget)
+    except RecursionError:
+        # Route through the tracker so this shares the run-wide
+        # warning cap and is counted in the run summary.
+        _report_truncation(tracker, f"Recursion limit hit while walking "
+                                    f"{db_path}:{key_path} -- output for this "
+                                    f"cell is truncated.")
+        truncated_keys.append(key_path)
+        return
+    if budget.truncated:
+        truncated_keys.append(key_path)
+
+
+# Truncation hint recorded when a database scan is abandoned on a database
+# error; everything after it in the database is unscanned.
+DB_ERROR_HINT = "<truncated: database error>"
+
+
+def _scan_sqlite(db_path, options, records, tracker=None, units=None, conn=None):
+    """Decode one SQLite database into `records` (a caller-owned list or
+    _RecordSink, appended in place). Returns the list of truncated cell keys /
+    truncation hints, or None if the database couldn't be opened at all.
+
+    `units` restricts the scan to a list of (table, rowid_range) pairs (see
+    _plan_sqlite); by default every table is scanned whole. `conn` may be an
+    already-open connection from _connect_sqlite, which is left open.
+    """
+    own_conn = conn is None
+    if own_conn:
+        try:
+            conn = _connect_sqlite(db_path)
+        except Exception as e:
+            print(f"Skipping unreadable database {db_path}: {e}")
+            return None
+
+    truncated_keys = []
+    try:
+        cur = conn.cursor()
+        if units is None:
+            units = [(table, None) for table in _list_tables(cur)]
+        for table, rowid_range in units:
+            _scan_table(cur, db_path, table, rowid_range, options, records,
+                        tracker, truncated_keys)
     except sqlite3.DatabaseError as e:
         # Emit whatever was collected before the failure rather than discarding
         # it -- partial evidence still belongs in the report. The scan of this
         # database stopped early, so mark it: a reader of the TSV alone must be
         # able to see the database was abandoned partway, not mistake the rows
         # already written for a complete scan.
-        if tracker is None or tracker.note_truncated():
-            print(f"Stopping scan of database {db_path}: {e}")
-        truncated_keys.append("<truncated: database error>")
+        _report_truncation(tracker, f"Stopping scan of database {db_path}: {e}")
+        truncated_keys.append(DB_ERROR_HINT)
+    finally:
+        if own_conn:
+            conn.close()
+    return truncated_keys
+
+
+def _rowid_chunks(cur, quoted, lo, hi, chunk_rows):
+    """Consecutive inclusive (lo, hi) rowid ranges of `chunk_rows` rows each
+    (the last one shorter) covering a table whose rowids run from `lo` to
+    `hi`, or None if the table holds no more than `chunk_rows` rows.
+
+    Cut points are real rowids, found by stepping `chunk_rows` rows along the
+    rowid b-tree from the previous one, so a table with sparse rowids (a
+    deleted range, a huge explicit INTEGER PRIMARY KEY) makes as many ranges
+    as its row count calls for, not its rowid span. Together with the
+    count(*) this reads the table's b-tree once, without decoding any rows.
+    """
+    cur.execute(f"SELECT count(*) FROM {quoted}")
+    if cur.fetchone()[0] <= chunk_rows:
+        return None
+    starts = [lo]
+    while True:
+        cur.execute(f"SELECT rowid FROM {quoted} WHERE rowid >= ? "
+                    f"ORDER BY rowid LIMIT 1 OFFSET ?", (starts[-1], chunk_rows))
+        row = cur.fetchone()
+        if row is None:
+            break
+        starts.append(row[0])
+    return [(start, end - 1) for start, end in zip(starts, starts[1:])] \
+        + [(starts[-1], hi)]
+
+
+def _plan_sqlite(db_path, chunk_rows):
+    """Split a database into scan tasks for --workers, each a list of
+    (table, rowid_range) units covering roughly `chunk_rows` rows.
+
+    Tables are kept in sqlite_master order and a table larger than
+    `chunk_rows` rows is cut into consecutive rowid ranges (see
+    _rowid_chunks), so scanning the tasks in order visits rows in exactly the
+    order a whole-database scan would. A table whose rowid span, read from
+    the rowid b-tree in O(log n), is under `chunk_rows` is known to be small
+    without counting it. Consecutive small tables share a task. WITHOUT
+    ROWID and virtual tables are never split.
+
+    Returns None if the database can't be planned (unreadable, corrupt, ...)
+    or would only make a single task; the caller then scans it whole, which
+    also reports any error exactly as a serial run would.
+    """
+    try:
+        conn = _connect_sqlite(db_path)
+    except Exception:
+        return None
+    tasks, current, current_rows = [], [], 0
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type='table' "
+            "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'"
+        )
+        for table, sql in cur.fetchall():
+            span = None
+            if not (sql or "").lstrip().upper().startswith("CREATE VIRTUAL"):
+                try:
+                    cur.execute(f"SELECT min(rowid), max(rowid) FROM {_quote_ident(table)}")
+                    lo, hi = cur.fetchone()
+                except sqlite3.DatabaseError:
+                    lo = hi = None
+                if isinstance(lo, int) and isinstance(hi, int):
+                    span = (lo, hi)
+            chunks = None
+            if span is not None and span[1] - span[0] >= chunk_rows:
+                chunks = _rowid_chunks(cur, _quote_ident(table), span[0], span[1],
+                                       chunk_rows)
+            if chunks is None:
+                current.append((table, None))
+                current_rows += (chunk_rows if span is None
+                                 else min(span[1] - span[0] + 1, chunk_rows))
+            else:
+                for chunk in chunks:
+                    if current:
+                        tasks.append(current)
+                    current = [(table, chunk)]
+                    current_rows = chunk_rows
+            if current_rows >= chunk_rows:
+                tasks.append(current)
+                current, current_rows = [], 0
+    except sqlite3.DatabaseError:
+        return None
     finally:
         conn.close()
+    if current:
+        tasks.append(current)
+    return tasks if len(tasks) > 1 else None
+
 
-    _emit_records(records, "sqlite", db_path, csv_writer, options)
+def process_sqlite_file(db_path, csv_writer, options, tracker=None):
+    """Scan a SQLite database read-only for timestamps in columns and embedded plists."""
+    sink = _RecordSink(csv_writer, options, "sqlite", db_path)
+    truncated_keys = _scan_sqlite(db_path, options, sink, tracker)
+    if truncated_keys is None:
+        return
     for key_path in truncated_keys:
         _emit_truncation_row(csv_writer, options, "sqlite", db_path, key_path)
     print(f"Evaluating: {db_path}")
 
 
+# Options for the current --workers process, installed once per worker by
+# _init_worker rather than pickled into every task.
+_WORKER_OPTIONS = None
+# The worker's own read-only connection, kept open across consecutive chunk
+# tasks for the same database: (db_path, connection) or None.
+_WORKER_CONN = None
+
+# One --workers task's outcome. `file_type` is None when the file was skipped
+# (not a plist/SQLite file, or unparseable). `plan`, when set, means the file
+# is a database to be scanned as the given _plan_sqlite tasks instead, and
+# the other fields are empty.
+_TaskResult = namedtuple("_TaskResult", "file_type records truncated_keys log plan")
+
+
+class _WorkerLog:
+    """Ordered capture of everything a worker process would have printed.
+
+    Stands in for both stdout (via contextlib.redirect_stdout) and the
+    run-scoped _TruncationTracker while a worker scans one source, so the
+    parent can replay the output -- and route each truncation warning through
+    the *real* tracker -- in the exact order a serial run would have produced
+    it. That keeps the MAX_PRINTED_TRUNCATION_WARNINGS cap and the end-of-run
+    summary counted across all workers, not per worker.
+
+    `memo_counts`, `dedup_counts` and `table_counts` carry the worker's
+    interpret_value memo counts, content dedup counts and SQLite table
+    throughput for the task (see _DecodeMemo.take_counts,
+    _ContentDedup.take_counts and _TableStats.take) back to the parent for
+    --stats.
+    """
+
+    __slots__ = ("events", "memo_counts", "dedup_counts", "table_counts")
+
+    def __init__(self):
+        self.events = []
+        self.memo_counts = None
+        self.dedup_counts = None
+        self.table_counts = None
+
+    def write(self, text):
+        self.events.append((False, text))
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def report(self, message):
+        self.events.append((True, message))
+
+    def replay(self, tracker, ctx=None):
+        """Replay the output through `tracker`, and add the task's counts to
+        the parent's DecodeContext `ctx`."""
+        for is_warning, text in self.events:
+            if is_warning:
+                _report_truncation(tracker, text)
+            else:
+                sys.stdout.write(text)
+        if ctx is not None:
+            if self.memo_counts is not None:
+                ctx.memo.add_counts(self.memo_counts)
+            if self.dedup_counts is not None:
+                ctx.dedup.add_counts(self.dedup_counts)
+            if self.table_counts is not None:
+                ctx.table_stats.merge(self.table_counts)
+
+
+def _init_worker(options):
+    global _WORKER_OPTIONS
+    _WORKER_OPTIONS = options
+    # A forked worker inherits whatever the parent's memo, dedup cache and
+    # table stats held, including counts already merged from other workers;
+    # start from zero so none are reported twice.
+    options.decode_ctx.memo.clear()
+    options.decode_ctx.dedup.clear()
+    options.decode_ctx.table_stats.take()
+
+
+def _scan_task(path):
+    """Worker entry point: classify and decode one file (see _TaskResult)."""
+    options = _WORKER_OPTIONS
+    log = _WorkerLog()
+    records = _SettledRecords(options)
+    file_type = truncated_keys = None
+    with contextlib.redirect_stdout(log), _open_source(path) as source:
+        kind = source.kind
+        if kind in ("plist", "bplist"):
+            truncated_keys = _scan_plist(path, options, records, tracker=log,
+                                         data=source.data)
+            if truncated_keys is not None:
+                file_type = source.file_type
+        elif kind == "sqlite":
+            plan = None
+            if options.sqlite_chunk_rows > 0:
+                plan = _plan_sqlite(path, options.sqlite_chunk_rows)
+            if plan is not None:
+                return _TaskResult("sqlite", [], [], log, plan)
+            truncated_keys = _scan_sqlite(path, options, records, tracker=log)
+            if truncated_keys is not None:
+                file_type = "sqlite"
+    log.memo_counts = options.decode_ctx.memo.take_counts()
+    log.dedup_counts = options.decode_ctx.dedup.take_counts()
+    log.table_counts = options.decode_ctx.table_stats.take()
+    return _TaskResult(file_type, records.items, truncated_keys, log, None)
+
+
+def _sqlite_chunk_task(db_path, units):
+    """Worker entry point: decode one _plan_sqlite task of a database.
+
+    Returns (records, truncated_keys, log). Uses this worker's own read-only
+    immutable connection, reused while consecutive tasks hit the same
+    database.
+    """
+    global _WORKER_CONN
+    log = _WorkerLog()
+    records = _SettledRecords(_WORKER_OPTIONS)
+    with contextlib.redirect_stdout(log):
+        if _WORKER_CONN is not None and _WORKER_CONN[0] != db_path:
+            _WORKER_CONN[1].close()
+            _WORKER_CONN = None
+        if _WORKER_CONN is None:
+            try:
+                _WORKER_CONN = (db_path, _connect_sqlite(db_path))
+            except Exception as e:
+                _report_truncation(log, f"Stopping scan of database {db_path}: {e}")
+                return records.items, [DB_ERROR_HINT], log
+        truncated_keys = _scan_sqlite(db_path, _WORKER_OPTIONS, records,
+                                      tracker=log, units=units,
+                                      conn=_WORKER_CONN[1])
+    log.memo_counts = _WORKER_OPTIONS.decode_ctx.memo.take_counts()
+    log.dedup_counts = _WORKER_OPTIONS.decode_ctx.dedup.take_counts()
+    log.table_counts = _WORKER_OPTIONS.decode_ctx.table_stats.take()
+    return records.items, truncated_keys, log
+
+
+# Built-in --skip-bulky profile: locations and file types on macOS/iOS images
+# that are large, numerous, and never plists or SQLite databases. Patterns
+# containing "/" are directories pruned from the walk (matched at any depth);
+# the rest are file names. Matching is case-insensitive.
+BULKY_PROFILE = (
+    # dyld shared caches and cryptex-delivered system content
+    "System/Library/dyld",
+    "System/Library/Caches/com.apple.dyld",
+    "System/Cryptexes",
+    "System/Volumes/Preboot/Cryptexes",
+    "private/preboot/Cryptexes",
+    "private/var/db/dyld",
+    "dyld_shared_cache*",
+    # swap and hibernation images
+    "private/var/vm",
+    "swapfile*",
+    "sleepimage",
+    # photo/video libraries (Photos.sqlite lives in database/, not here)
+    "*.photoslibrary/originals",
+    "*.photoslibrary/resources/derivatives",
+    "*.photoslibrary/resources/renders",
+    "Media/DCIM",
+    "Media/PhotoData/Thumbnails",
+    "*.heic", "*.jpg", "*.jpeg", "*.png", "*.gif", "*.tif", "*.tiff",
+    "*.mov", "*.mp4", "*.m4v", "*.avi", "*.m4a", "*.mp3", "*.wav",
+    # disk images and firmware
+    "*.dmg", "*.ipsw", "*.iso", "*.sparseimage", "*.vmdk",
+)
+
+_SIZE_SUFFIXES = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def _parse_size(text):
+    """Parse a byte count such as "512", "64K", "10M" or "2G" (binary units)."""
+    m = re.fullmatch(r"\s*(\d+)\s*([KMGT]?)(?:i?B)?\s*", text, re.IGNORECASE)
+    if not m:
+        raise ValueError(f"invalid size: {text!r}")
+    return int(m.group(1)) * _SIZE_SUFFIXES[m.group(2).upper()]
+
+
+def _glob_regexes(patterns, flags=0):
+    """Compile shell globs into (name_re, path_re), either of which may be
+    None. Globs without "/" match a bare file or directory name; globs with
+    one match the path relative to the walk root, at any depth (so
+    "private/var/vm" also matches "Data/private/var/vm")."""
+    names = [fnmatch.translate(p) for p in patterns if "/" not in p]
+    paths = []
+    for p in patterns:
+        if "/" in p:
+            p = p.strip("/")
+            paths += [fnmatch.translate(p), fnmatch.translate("*/" + p)]
+    name_re = re.compile("|".join(names), flags) if names else None
+    path_re = re.compile("|".join(paths), flags) if paths else None
+    return name_re, path_re
+
+
+def _glob_hit(regexes, rel, name):
+    name_re, path_re = regexes
+    return bool((name_re and name_re.match(name)) or (path_re and path_re.match(rel)))
+
+
+class _WalkFilter:
+    """Decides, during the directory walk and before anything is opened,
+    which files are worth classifying: --include/--exclude globs,
+    --min-size/--max-size, and the --skip-bulky profile. Excluded
+    directories are pruned so their contents are never even listed.
+
+    Keeps a count per skip reason so the run can report what it passed over
+    (see summary()); a file is counted once, under the first reason that
+    applies. Sizes come from a stat() only when a size limit is set.
+    """
+
+    def __init__(self, options):
+        self.include = _glob_regexes(options.include) if options.include else None
+        self.exclude = _glob_regexes(options.exclude or ())
+        self.bulky = (_glob_regexes(BULKY_PROFILE, re.IGNORECASE)
+                      if options.skip_bulky else (None, None))
+        self.min_size = options.min_size
+        self.max_size = options.max_size
+        self.skipped = {}
+        self.pruned_dirs = 0
+
+    @property
+    def active(self):
+        return bool(self.include or any(self.exclude) or any(self.bulky)
+                    or self.min_size or self.max_size is not None)
+
+    def _skip(self, reason):
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+        return True
+
+    def skip_dir(self, rel, name):
+        if _glob_hit(self.exclude, rel, name) or _glob_hit(self.bulky, rel, name):
+            self.pruned_dirs += 1
+            return True
+        return False
+
+    def skip_file(self, path, rel, name):
+        if _glob_hit(self.exclude, rel, name):
+            return self._skip("--exclude")
+        if self.include and not _glob_hit(self.include, rel, name):
+            return self._skip("not matched by --include")
+        if _glob_hit(self.bulky, rel, name):
+            return self._skip("--skip-bulky")
+        if self.min_size or self.max_size is not None:
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                return False  # let the open report it
+            if size < self.min_size:
+                return self._skip("below --min-size")
+            if self.max_size is not None and size > self.max_size:
+                return self._skip("above --max-size")
+        return False
+
+    def summary(self):
+        """One line describing everything skipped, or None if nothing was."""
+        if not self.skipped and not self.pruned_dirs:
+            return None
+        parts = [f"{n:,} {reason}" for reason, n in
+                 sorted(self.skipped.items(), key=lambda kv: -kv[1])]
+        if self.pruned_dirs:
+            parts.append(f"{self.pruned_dirs:,} excluded director"
+                         f"{'y' if self.pruned_dirs == 1 else 'ies'} not walked")
+        total = sum(self.skipped.values())
+        return (f"Skipped {total:,} file(s) without opening them: "
+                + ", ".join(parts) + ".")
+
+
+def _iter_paths(directory_path, walk_filter=None):
+    if walk_filter is None or not walk_filter.active:
+        for root, _, files in os.walk(directory_path):
+            for file in files:
+                yield os.path.join(root, file)
+        return
+    top = len(os.path.join(directory_path, ""))
+    for root, dirs, files in os.walk(directory_path):
+        rel_root = root[top:].replace(os.sep, "/")
+        prefix = rel_root + "/" if rel_root else ""
+        # Pruning `dirs` in place stops os.walk descending into them.
+        dirs[:] = [d for d in dirs if not walk_filter.skip_dir(prefix + d, d)]
+        for file in files:
+            path = os.path.join(root, file)
+            if not walk_filter.skip_file(path, prefix + file, file):
+                yield path
+
+
+def _process_parallel(paths, csv_writer, options, tracker, cache=None):
+    """Fan files out to `options.workers` processes; emit in walk order.
+
+    Results are consumed strictly in submission order, so the TSV rows, the
+    console output and the truncation-warning cap all come out exactly as a
+    serial run would produce them. At most a few tasks per worker are in
+    flight at once, so one slow source (a huge database) holds back only a
+    bounded number of finished results rather than the rest of the tree.
+    With a `cache`, sources it already holds are replayed in their place in
+    that order instead of being submitted, and fresh results are stored.
+    """
+    window = options.workers * 4
+    pending = deque()
+    ctx = options.decode_ctx
+
+    def drain_one(pool):
+        path, future, stat = pending.popleft()
+        if stat is None:
+            cache.replay(future, path, csv_writer, options, tracker)
+            return
+        result = future.result()
+        fill = cache.fill(path, stat) if cache is not None else None
+        if result.plan is not None:
+            result.log.replay(tracker, ctx)
+            if fill is not None:
+                fill.add_events(result.log.events)
+            _drain_sqlite_plan(pool, path, result.plan, csv_writer, options,
+                               tracker, window, fill)
+            return
+        if fill is not None:
+            fill.extend(result.records)
+            fill.add_events(result.log.events)
+            fill.finish(result.file_type, result.truncated_keys)
+        if result.file_type is not None:
+            _emit_source(csv_writer, options, result.file_type, path,
+                         result.records, result.truncated_keys)
+        result.log.replay(tracker, ctx)
+        if result.file_type is not None:
+            print(f"Evaluating: {path}")
+
+    with ProcessPoolExecutor(max_workers=options.workers,
+                             initializer=_init_worker,
+                             initargs=(options,)) as pool:
+        for path in paths:
+            if cache is not None:
+                stat = cache.stat(path)
+                if stat is None:
+                    continue
+                entry = cache.lookup(path, stat)
+                if entry is not None:
+                    pending.append((path, entry, None))
+                    continue
+            else:
+                stat = ()
+            pending.append((path, pool.submit(_scan_task, path), stat))
+            if len(pending) >= window:
+                drain_one(pool)
+        while pending:
+            drain_one(pool)
+
+
+def _drain_sqlite_plan(pool, db_path, plan, csv_writer, options, tracker, window,
+                       fill=None):
+    """Scan one database's _plan_sqlite tasks across the pool and emit them
+    in plan (table, then rowid) order -- the order a serial scan produces.
+
+    A task that stops on a database error ends the database exactly where a
+    serial scan would have: its rows and marker are kept, and every later
+    task's output is discarded.
+    """
+    sink = _RecordSink(csv_writer, options, "sqlite", db_path)
+    truncated_keys = []
+    tasks = iter(plan)
+    inflight = deque()
+    for units in tasks:
+        inflight.append(pool.submit(_sqlite_chunk_task, db_path, units))
+        if len(inflight) >= window:
+            break
+    while inflight:
+        records, keys, log = inflight.popleft().result()
+        sink.extend(records)
+        truncated_keys.extend(keys)
+        log.replay(tracker, options.decode_ctx)
+        if fill is not None:
+            fill.extend(records)
+            fill.add_events(log.events)
+        if keys and keys[-1] == DB_ERROR_HINT:
+            for future in inflight:
+                future.cancel()
+            break
+        units = next(tasks, None)
+        if units is not None:
+            inflight.append(pool.submit(_sqlite_chunk_task, db_path, units))
+    if fill is not None:
+        fill.finish("sqlite", truncated_keys)
+    for key_path in truncated_keys:
+        _emit_truncation_row(csv_writer, options, "sqlite", db_path, key_path)
+    print(f"Evaluating: {db_path}")
+
+
+# Bump whenever a decoding change makes previously cached Records stale.
+CACHE_FORMAT = 1
+
+
+class _TeeLog(_WorkerLog):
+    """A _WorkerLog that also passes everything straight through to the real
+    stdout and tracker, for a cache fill during a serial run."""
+
+    __slots__ = ("_stdout", "_tracker")
+
+    def __init__(self, tracker):
+        super().__init__()
+        self._stdout = sys.stdout
+        self._tracker = tracker
+
+    def write(self, text):
+        self.events.append((False, text))
+        return self._stdout.write(text)
+
+    def report(self, message):
+        self.events.append((True, message))
+        # The tracker prints; keep that from being captured a second time.
+        with contextlib.redirect_stdout(self._stdout):
+            _report_truncation(self._tracker, message)
+
+
+class _Tee:
+    """`records` stand-in that appends each Record to several sinks."""
+
+    __slots__ = ("_sinks",)
+
+    def __init__(self, *sinks):
+        self._sinks = sinks
+
+    def append(self, r):
+        for sink in self._sinks:
+            sink.append(r)
+
+
+class _ScanCache:
+    """On-disk cache of decoded Records per source, for --cache.
+
+    A SQLite file holding, for each (path, decode options) pair, the
+    source's size and mtime when it was scanned, its unfiltered Records in
+    order, its truncation keys, and what the scan printed. A repeat run over
+    unchanged evidence replays that instead of re-parsing, then applies the
+    run's own --on/--after/--before/--between/--validate filtering exactly
+    as a fresh scan would -- which is why SQL range pushdown is disabled
+    while caching (see _pushdown_clause).
+
+    An entry is only trusted while the source's size and mtime still match
+    and the options that change decoding (--deepscan, --nonest,
+    --nestdepth, --nocontext, --sample-rows, --verbose, the current year for
+    the plausibility window, and the script/cache format versions) are the
+    same; otherwise the source is re-scanned and the entry replaced. When the
+    cached data grows past `max_bytes`, the least recently used sources are
+    evicted at the end of the run.
+    """
+
+    def __init__(self, cache_path, options, max_bytes):
+        self._max_bytes = max_bytes
+        self._optkey = json.dumps([
+            CACHE_FORMAT, SCRIPT_VERSION, options.deepscan, options.nonest,
+            options.nestdepth, options.nocontext, options.sample_rows,
+            options.verbose, (options.decode_ctx or DecodeContext()).year,
+        ])
+        self._now = time.time()
+        self._conn = sqlite3.connect(cache_path)
+        self._conn.executescript("""
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL,
+                optkey TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                file_type TEXT,
+                truncated TEXT,
+                log TEXT,
+                nbytes INTEGER NOT NULL DEFAULT 0,
+                last_used REAL NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (path, optkey)
+            );
+            CREATE TABLE IF NOT EXISTS records (
+                source_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                iso TEXT, original TEXT, fmt TEXT, key TEXT,
+                confidence TEXT, context TEXT, dt_us INTEGER,
+                PRIMARY KEY (source_id, seq)
+            ) WITHOUT ROWID;
+        """)
+
+    @staticmethod
+    def stat(path):
+        """(size, mtime_ns) identifying the current contents of `path`, or
+        None if it can't be stat'ed (vanished mid-walk)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def lookup(self, path, stat):
+        """The cached entry for `path`, or None if there isn't a valid one."""
+        row = self._conn.execute(
+            "SELECT id, size, mtime_ns, file_type, truncated, log, complete "
+            "FROM sources WHERE path = ? AND optkey = ?",
+            (os.path.abspath(path), self._optkey),
+        ).fetchone()
+        if row is None:
+            return None
+        source_id, size, mtime_ns, file_type, truncated, log, complete = row
+        if not complete or (size, mtime_ns) != stat:
+            self._delete(source_id)
+            return None
+        self._conn.execute("UPDATE sources SET last_used = ? WHERE id = ?",
+                           (self._now, source_id))
+        return source_id, file_type, json.loads(truncated), json.loads(log)
+
+    def replay(self, entry, path, csv_writer, options, tracker):
+        """Emit a cached source exactly as process_file/process_sqlite_file
+        would have."""
+        source_id, file_type, truncated_keys, events = entry
+        if file_type is not None:
+            sink = _RecordSink(csv_writer, options, file_type, path)
+            for iso, original, fmt, key, confidence, context, dt_us in self._conn.execute(
+                    "SELECT iso, original, fmt, key, confidence, context, dt_us "
+                    "FROM records WHERE source_id = ? ORDER BY seq", (source_id,)):
+                dt = _us_to_dt(dt_us)
+                sink.append(Record(iso, original, fmt, key, confidence, context, dt))
+            for key_hint in truncated_keys:
+                _emit_truncation_row(csv_writer, options, file_type, path, key_hint)
+        log = _WorkerLog()
+        log.events = [tuple(e) for e in events]
+        log.replay(tracker)
+        if file_type is not None:
+            print(f"Evaluating: {path}")
+
+    def fill(self, path, stat):
+        """Start (re)recording `path`; see _CacheFill."""
+        path = os.path.abspath(path)
+        row = self._conn.execute(
+            "SELECT id FROM sources WHERE path = ? AND optkey = ?",
+            (path, self._optkey)).fetchone()
+        if row is not None:
+            self._delete(row[0])
+        cur = self._conn.execute(
+            "INSERT INTO sources (path, optkey, size, mtime_ns, last_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (path, self._optkey, stat[0], stat[1], self._now))
+        return _CacheFill(self._conn, cur.lastrowid)
+
+    def _delete(self, source_id):
+        self._conn.execute("DELETE FROM records WHERE source_id = ?", (source_id,))
+        self._conn.execute("DELETE FROM sources WHERE id = ?", (source_id,))
+
+    def close(self):
+        """Evict least-recently-used sources down to the size bound, then
+        close the cache."""
+        total = self._conn.execute(
+            "SELECT coalesce(sum(nbytes), 0) FROM sources").fetchone()[0]
+        if total > self._max_bytes:
+            for source_id, nbytes in self._conn.execute(
+                    "SELECT id, nbytes FROM sources "
+                    "ORDER BY last_used, id").fetchall():
+                if total <= self._max_bytes:
+                    break
+                self._delete(source_id)
+                total -= nbytes
+        self._conn.commit()
+        self._conn.close()
+
+
+class _CacheFill:
+    """Records one source's scan into the cache as it happens: a `records`
+    stand-in (append/extend), plus the console events and truncation keys.
+    The entry only becomes valid once finish() commits it, so a run that
+    dies partway never leaves a half-recorded source to be replayed."""
+
+    __slots__ = ("_conn", "_source_id", "_rows", "_seq", "_nbytes", "_events")
+
+    def __init__(self, conn, source_id):
+        self._conn = conn
+        self._source_id = source_id
+        self._rows = []
+        self._seq = 0
+        self._nbytes = 0
+        self._events = []
+
+    def append(self, r):
+        dt_us = _dt_to_us(r.dt)
+        context = str(r.context)
+        self._rows.append((self._source_id, self._seq, r.iso, r.original, r.fmt,
+                           r.key, r.confidence, context, dt_us))
+        self._seq += 1
+        self._nbytes += 64 + len(r.original) + len(r.key) + len(context)
+        if len(self._rows) >= 10_000:
+            self._flush()
+
+    def extend(self, records):
+        for r in records:
+            self.append(r)
+
+    def add_events(self, events):
+        self._events.extend(events)
+
+    def _flush(self):
+        self._conn.executemany(
+            "INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._rows)
+        self._rows = []
+
+    def finish(self, file_type, truncated_keys):
+        """Commit the entry; `file_type` None records a skipped source."""
+        self._flush()
+        self._conn.execute(
+            "UPDATE sources SET file_type = ?, truncated = ?, log = ?, "
+            "nbytes = ?, complete = 1 WHERE id = ?",
+            (file_type, json.dumps(truncated_keys or []), json.dumps(self._events),
+             self._nbytes, self._source_id))
+        self._conn.commit()
+
+
+def _process_with_cache(path, csv_writer, options, tracker, cache):
+    """Serial-run counterpart of process_file/process_sqlite_file for
+    --cache: replay `path` from the cache, or scan it and record the scan."""
+    stat = cache.stat(path)
+    if stat is None:
+        return
+    entry = cache.lookup(path, stat)
+    if entry is not None:
+        cache.replay(entry, path, csv_writer, options, tracker)
+        return
+    fill = cache.fill(path, stat)
+    log = _TeeLog(tracker)
+    file_type = truncated_keys = None
+    with contextlib.redirect_stdout(log), _open_source(path) as source:
+        kind = source.kind
+        if kind in ("plist", "bplist"):
+            file_type = source.file_type
+            sink = _RecordSink(csv_writer, options, file_type, path)
+            truncated_keys = _scan_plist(path, options, _Tee(sink, fill), tracker=log,
+                                         data=source.data)
+        elif kind == "sqlite":
+            file_type = "sqlite"
+            sink = _RecordSink(csv_writer, options, file_type, path)
+            truncated_keys = _scan_sqlite(path, options, _Tee(sink, fill), tracker=log)
+    if truncated_keys is None:
+        file_type = None
+    fill.add_events(log.events)
+    fill.finish(file_type, truncated_keys)
+    if file_type is None:
+        return
+    for key_hint in truncated_keys:
+        _emit_truncation_row(csv_writer, options, file_type, path, key_hint)
+    print(f"Evaluating: {path}")
+
+
 def process_directory(directory_path, output_file_path, options):
+    # One DecodeContext (reference "now") for the whole run, so every value is
+    # judged against the same instant -- including in worker processes, which
+    # receive it with `options`.
+    if options.decode_ctx is None:
+        options = options._replace(decode_ctx=DecodeContext())
     # One tracker shared across the whole run (fix wave 3, Important-4/5):
     # caps per-source stdout truncation warnings at MAX_PRINTED_TRUNCATION_
     # WARNINGS and, if any source truncated, prints one run-level summary
@@ -1248,22 +4370,44 @@ def process_directory(directory_path, output_file_path, options):
     # individual source's own node-visit budget/limit; see
     # _TruncationTracker.
     tracker = _TruncationTracker()
-    with open(output_file_path, "w", newline="", encoding="utf-8") as output_file:
-        csv_writer = csv.writer(output_file, delimiter="\t")
-        csv_writer.writerow(build_headers(options))
-
-        for root, _, files in os.walk(directory_path):
-            for file in files:
-                path = os.path.join(root, file)
-                kind = get_file_kind(path)
-                if kind in ("plist", "bplist"):
-                    process_file(path, csv_writer, options, tracker=tracker)
-                elif kind == "sqlite":
-                    process_sqlite_file(path, csv_writer, options, tracker=tracker)
+    walk_filter = _WalkFilter(options)
+    cache = None
+    if options.cache_path:
+        cache = _ScanCache(options.cache_path, options,
+                           options.cache_max_mb * 1024 * 1024)
+    try:
+        output = OUTPUT_FORMATS[options.output_format]
+        with output(output_file_path, build_headers(options)) as csv_writer:
+            paths = _iter_paths(directory_path, walk_filter)
+            if options.workers > 1:
+                _process_parallel(paths, csv_writer, options, tracker, cache)
+            elif cache is not None:
+                for path in paths:
+                    _process_with_cache(path, csv_writer, options, tracker, cache)
+            else:
+                for path in paths:
+                    with _open_source(path) as source:
+                        if source.kind in ("plist", "bplist"):
+                            process_file(path, csv_writer, options, tracker=tracker,
+                                         source=source)
+                        elif source.kind == "sqlite":
+                            process_sqlite_file(path, csv_writer, options, tracker=tracker)
+    finally:
+        if cache is not None:
+            cache.close()
 
+    summary = walk_filter.summary()
+    if summary:
+        print(summary)
     summary = tracker.summary()
     if summary:
         print(summary)
+    if options.stats:
+        print(options.decode_ctx.memo.summary())
+        print(options.decode_ctx.dedup.summary())
+        summary = options.decode_ctx.table_stats.summary()
+        if summary:
+            print(summary)
 
 
 # ---------------------------------------------------------------------------
@@ -1271,13 +4415,25 @@ def process_directory(directory_path, output_file_path, options):
 # ---------------------------------------------------------------------------
 
 Options = namedtuple(
-    "Options", "validate deepscan nocontext nonest nestdepth date_filter"
+    "Options",
+    "validate deepscan nocontext nonest nestdepth date_filter workers "
+    "sqlite_chunk_rows sample_rows verbose cache_path cache_max_mb "
+    "include exclude min_size max_size skip_bulky decode_ctx stats output_format "
+    "sqlite_fetch_rows",
+    defaults=(1, 200_000, 0, False, None, 1024, None, None, 0, None, False, None,
+              False, "tsv", SQLITE_FETCH_ROWS),
 )
 
 
 def main():
     import argparse
 
+    def _size_arg(text):
+        try:
+            return _parse_size(text)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
     parser = argparse.ArgumentParser(
         description=(
             "Extract timestamps from PList files and convert them to ISO 8601 UTC "
@@ -1307,6 +4463,83 @@ def main():
     parser.add_argument("--nocontext", action="store_true", help="Omit the Context column for quicker/leaner runs.")
     parser.add_argument("--nonest", action="store_true", help="Skip embedded/nested plist extraction (fast triage).")
     parser.add_argument("--nestdepth", type=int, default=5, help="Max embedded-plist recursion depth (default 5).")
+    parser.add_argument(
+        "--workers", type=int, default=1, metavar="N",
+        help="Decode files in N worker processes (default 1; 0 = one per CPU). "
+             "Output is identical to a single-process run.",
+    )
+    parser.add_argument(
+        "--sqlite-chunk-rows", type=int, default=200_000, metavar="N",
+        help="With --workers, split SQLite databases across workers by table, and "
+             "large tables into rowid ranges of about N rows (default 200000; "
+             "0 = scan each database in a single worker).",
+    )
+    parser.add_argument(
+        "--sqlite-fetch-rows", type=int, default=SQLITE_FETCH_ROWS, metavar="N",
+        help=f"Read SQLite rows N at a time (default {SQLITE_FETCH_ROWS}). Larger "
+             "batches decode faster and use more memory per table.",
+    )
+    parser.add_argument(
+        "--sample-rows", type=int, default=0, metavar="N",
+        help="Opt-in speedup: sample the first N rows of each SQLite table and skip "
+             "TEXT/BLOB columns in which nothing decodes. A skipped column's later "
+             "timestamps are missed (default 0 = scan every column). "
+             "--deepscan always scans every column.",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true",
+        help="Print per-column scan/skip decisions for each SQLite table "
+             "(with --sample-rows).",
+    )
+    parser.add_argument(
+        "--cache", metavar="PATH",
+        help="Keep decoded results per source in this SQLite file and reuse them on "
+             "later runs over unchanged files (same size and mtime). Only the "
+             "filters are re-applied.",
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=int, default=1024, metavar="N",
+        help="Evict least-recently-used sources from --cache once it holds more "
+             "than about N MB of results (default 1024).",
+    )
+    parser.add_argument(
+        "--reference-time", metavar="ISO8601",
+        help="Judge plausibility and validation against this UTC date/time "
+             "instead of the current time (e.g. 2024-06-01 or "
+             "2024-06-01T12:00:00Z), for reproducible results.",
+    )
+    parser.add_argument(
+        "--include", action="append", metavar="GLOB",
+        help="Only consider files matching GLOB (repeatable). A glob with a '/' "
+             "matches the path under the search directory, otherwise the file name.",
+    )
+    parser.add_argument(
+        "--exclude", action="append", metavar="GLOB",
+        help="Skip files and directories matching GLOB (repeatable), without "
+             "opening them. Same matching rules as --include.",
+    )
+    parser.add_argument(
+        "--min-size", type=_size_arg, default=0, metavar="SIZE",
+        help="Skip files smaller than SIZE bytes (suffixes K, M, G, T).",
+    )
+    parser.add_argument(
+        "--max-size", type=_size_arg, default=None, metavar="SIZE",
+        help="Skip files larger than SIZE bytes (suffixes K, M, G, T).",
+    )
+    parser.add_argument(
+        "--skip-bulky", action="store_true",
+        help="Skip known-bulky Apple locations and media/disk-image files "
+             "(dyld caches, swap, photo originals, videos...) without opening them.",
+    )
+    parser.add_argument(
+        "--format", choices=sorted(OUTPUT_FORMATS), default="tsv",
+        help="Output format: tsv (default), parquet (needs pyarrow; typed "
+             f"timestamp column) or sqlite (indexed '{SQLITE_OUTPUT_TABLE}' table).",
+    )
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="Print decode statistics (memo hits/misses) at the end of the run.",
+    )
     args = parser.parse_args()
 
     # Validate mutually exclusive range flag combinations.
@@ -1322,6 +4555,20 @@ def main():
     except ValueError:
         parser.error("Date arguments must be in YYYY-MM-DD format.")
 
+    if args.format == "parquet" and pa is None:
+        parser.error("--format parquet requires the pyarrow package.")
+    compression = _compression_for(args.output_file_path)
+    if compression is not None and args.format != "tsv":
+        parser.error(".gz/.zst output is only supported with --format tsv.")
+    if compression == "zstd" and zstandard is None:
+        parser.error(".zst output requires the zstandard package.")
+
+    reference = None
+    if args.reference_time:
+        reference = _try_iso(args.reference_time)
+        if reference is None:
+            parser.error("--reference-time must be an ISO 8601 date or date-time.")
+
     options = Options(
         validate=args.validate,
         deepscan=args.deepscan,
@@ -1329,6 +4576,21 @@ def main():
         nonest=args.nonest,
         nestdepth=max(0, args.nestdepth),
         date_filter=date_filter,
+        workers=args.workers if args.workers > 0 else (os.cpu_count() or 1),
+        sqlite_chunk_rows=max(0, args.sqlite_chunk_rows),
+        sample_rows=max(0, args.sample_rows),
+        verbose=args.verbose,
+        cache_path=args.cache,
+        cache_max_mb=max(0, args.cache_max_mb),
+        include=args.include,
+        exclude=args.exclude,
+        min_size=args.min_size,
+        max_size=args.max_size,
+        skip_bulky=args.skip_bulky,
+        decode_ctx=DecodeContext(reference),
+        stats=args.stats,
+        output_format=args.format,
+        sqlite_fetch_rows=max(1, args.sqlite_fetch_rows),
     )
 
     process_directory(args.directory_to_search, args.output_file_path, options)